@@ -1,7 +1,11 @@
 # Entry point for jorkXL's Oblivion Remastered Mod Manager
 # This file will launch the main GUI
 
+import logging
+
 def main():
+    # Debug tracing (e.g. the undo stack) stays silent unless this is lowered
+    logging.basicConfig(level=logging.WARNING, format="[%(name)s] %(levelname)s: %(message)s")
     from mod_manager.utils import get_game_path, migrate_disabled_mods_if_needed
     game_path = get_game_path()
     if game_path:
@@ -1,8 +1,10 @@
 import os
 import shutil
 import glob
+from functools import lru_cache
 from pathlib import Path
-from .utils import get_game_path, load_pak_mods, save_pak_mods, get_custom_mod_dir_name, delete_display_info
+from types import MappingProxyType
+from .utils import get_game_path, load_pak_mods, save_pak_mods, get_custom_mod_dir_name, delete_display_info, mark_pak_mods_changed, pak_mods_epoch
 
 # --- Dynamic PAK Directory Discovery ---
 # Instead of hardcoding the full path, we search for the correct directory structure
@@ -99,11 +101,57 @@ DEFAULT_PAK_FILES = {
 def is_default_pak_file(filename):
     return os.path.basename(filename) in DEFAULT_PAK_FILES
 
+@lru_cache(maxsize=1)
+def _managed_paks_at(epoch):
+    """Read the managed PAK list for one pak_mods_epoch() value.
+
+    The entries are read-only views: the cache is shared by every caller, so
+    writing into one (as activate_pak does with pak_info) would corrupt it.
+    """
+    return tuple(MappingProxyType(pak) for pak in load_pak_mods()
+                 if not is_default_pak_file(pak.get("name", "")))
+
 def list_managed_paks():
     """
     Get the list of currently managed PAK mods, excluding default game files.
+
+    Returns fresh copies; pak_mods.json is only re-read after it has changed.
+    """
+    return [dict(pak) for pak in _managed_paks_at(pak_mods_epoch())]
+
+@lru_cache(maxsize=1)
+def _pak_index_at(epoch):
+    """Build ("subfolder|name" -> pak, name -> pak) lookups for one list version."""
+    by_id, by_name = {}, {}
+    for pak in _managed_paks_at(epoch):
+        # First entry wins, matching a front-to-back scan of the list
+        by_id.setdefault(f"{pak.get('subfolder', '') or ''}|{pak['name']}", pak)
+        by_name.setdefault(pak['name'], pak)
+    return MappingProxyType(by_id), MappingProxyType(by_name)
+
+def managed_pak_index():
+    """
+    Map "subfolder|name" PAK ids to their managed pak_info entries.
+
+    Rebuilt only after pak_mods.json changes. The index and its entries are
+    read-only; copy an entry with dict() before passing it to anything that
+    modifies pak_info, such as activate_pak or deactivate_pak.
+    """
+    return _pak_index_at(pak_mods_epoch())[0]
+
+def get_pak(pak_id, fallback_by_name=True):
+    """
+    Look up a managed PAK by its "subfolder|name" id.
+
+    With fallback_by_name, a PAK that has since moved to another subfolder is
+    still found by its file name. Returns a copy of the pak_info, or None if
+    there is no match.
     """
-    return [pak for pak in load_pak_mods() if not is_default_pak_file(pak.get("name", ""))]
+    by_id, by_name = _pak_index_at(pak_mods_epoch())
+    pak = by_id.get(pak_id)
+    if pak is None and fallback_by_name:
+        pak = by_name.get(pak_id.rpartition('|')[2])
+    return dict(pak) if pak is not None else None
 
 def get_related_files(directory, base_name):
     """
@@ -289,6 +337,8 @@ def deactivate_pak(game_path, pak_info):
     Returns:
         bool: True if successful, False otherwise
     """
+    # Files (and possibly pak_info) change below, so cached PAK lists must be re-read
+    mark_pak_mods_changed()
     paks_root = get_paks_root_dir(game_path)
     if not paks_root:
         return False
@@ -407,6 +457,8 @@ def activate_pak(game_path, pak_info):
     Returns:
         bool: True if successful, False otherwise
     """
+    # Files (and possibly pak_info) change below, so cached PAK lists must be re-read
+    mark_pak_mods_changed()
     paks_root = get_paks_root_dir(game_path)
     if not paks_root:
         return False
@@ -1,5 +1,6 @@
 # Handles mod registry logic 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from .utils import get_esp_folder, get_plugins_txt_path
 
 def list_esp_files():
@@ -25,4 +26,38 @@ def write_plugins_txt(plugin_list):
     with open(plugins_path, 'w', encoding='utf-8') as f:
         for plugin in plugin_list:
             f.write(f"{plugin}\n")
-    return True 
\ No newline at end of file
+    return True
+
+
+def delete_esp_files(esp_names):
+    """Delete several ESP files, rewriting plugins.txt only once.
+
+    Returns (deleted, failed) where failed is a list of (esp_name, error) pairs.
+    """
+    esp_folder = get_esp_folder()
+    if not esp_folder:
+        return [], [(name, "ESP folder not found") for name in esp_names]
+
+    def _remove(esp_name):
+        try:
+            os.remove(os.path.join(esp_folder, esp_name))
+            return esp_name, None
+        except OSError as e:
+            return esp_name, str(e)
+
+    deleted, failed = [], []
+    workers = min(8, os.cpu_count() or 1, len(esp_names)) or 1
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for esp_name, error in pool.map(_remove, esp_names):
+            if error is None:
+                deleted.append(esp_name)
+            else:
+                failed.append((esp_name, error))
+
+    # Only drop entries whose file is really gone, so a plugin that failed to
+    # delete keeps its enabled state
+    if deleted:
+        removed = set(deleted)
+        plugins = read_plugins_txt()
+        write_plugins_txt([p for p in plugins if p.lstrip('#').strip() not in removed])
+    return deleted, failed
@@ -66,6 +66,21 @@ def get_plugins_txt_path():
         return None
     return os.path.join(esp_folder, 'Plugins.txt')
 
+# --- PAK list change counter -------------------------------------------------
+# Bumped whenever pak_mods.json is (about to be) rewritten so callers can keep
+# a parsed copy of the list and only re-read it after a change.
+_PAK_MODS_EPOCH = 0
+
+def pak_mods_epoch():
+    """Return the current PAK list change counter."""
+    return _PAK_MODS_EPOCH
+
+def mark_pak_mods_changed():
+    """Invalidate any cached copies of the PAK mods list."""
+    global _PAK_MODS_EPOCH
+    _PAK_MODS_EPOCH += 1
+# ---------------------------------------------------------------------------
+
 def load_pak_mods():
     """Load PAK mods information from the JSON file.
     
@@ -97,6 +112,7 @@ def save_pak_mods(pak_mods_data):
     Returns:
         bool: True if successful, False otherwise.
     """
+    mark_pak_mods_changed()
     try:
         with open(PAK_MODS_FILE, 'w', encoding='utf-8') as f:
             json.dump(pak_mods_data, f, indent=2)
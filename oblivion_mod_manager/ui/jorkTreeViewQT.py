@@ -2,8 +2,11 @@ from PyQt5.QtCore import Qt, QAbstractItemModel, QModelIndex, QVariant, QMimeDat
 from PyQt5.QtGui  import QColor
 from mod_manager.utils import get_display_info, set_display_info
 import traceback
+from ui.row_builders import normalize_subfolder
 
 class _Node:
+    __slots__ = ("parent", "children", "data", "is_group")
+
     def __init__(self, data: dict | str, parent=None, is_group=False):
         self.parent   = parent
         self.children = []
@@ -82,9 +85,8 @@ class ModTreeModel(QAbstractItemModel):
             disp = get_display_info(row["id"])
             if not disp.get("display") and not disp.get("group"):
                 # Try normalized id (strip DisabledMods prefix)
-                import re
                 subfolder, name = row["id"].split("|", 1)
-                norm_subfolder = re.sub(r'^DisabledMods(?:[\\/]+|$)', '', subfolder, flags=re.IGNORECASE)
+                norm_subfolder = normalize_subfolder(subfolder)
                 norm_id = f"{norm_subfolder}|{name}"
                 disp = get_display_info(norm_id)
                 if not disp.get("display") and not disp.get("group"):
@@ -120,14 +122,14 @@ class ModTreeModel(QAbstractItemModel):
     def _build_tree(self):
         """(Re)populate self.root using self._rows."""
         self.root.children.clear()
+        self.leaves = []                   # flat list of leaf nodes, rebuilt with the tree
         groups = {}
         for r in self._rows:
             # Fallback logic for group lookup
             disp = get_display_info(r["id"])
             if not disp.get("group"):
-                import re
                 subfolder, name = r["id"].split("|", 1)
-                norm_subfolder = re.sub(r'^DisabledMods(?:[\\/]+|$)', '', subfolder, flags=re.IGNORECASE)
+                norm_subfolder = normalize_subfolder(subfolder)
                 norm_id = f"{norm_subfolder}|{name}"
                 disp = get_display_info(norm_id)
                 if not disp.get("group"):
@@ -152,7 +154,9 @@ class ModTreeModel(QAbstractItemModel):
                     parent.children.append(node)
                     groups[key] = node
                 parent = groups[key]
-            parent.children.append(_Node(r, parent, is_group=False))
+            leaf = _Node(r, parent, is_group=False)
+            parent.children.append(leaf)
+            self.leaves.append(leaf)
 
         # Only populate self.root.children; do not reset the model here
         return True
@@ -4,13 +4,17 @@ import os
 import shutil
 import tempfile
 import uuid
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton,
     QListWidget, QListWidgetItem, QFileDialog, QMessageBox, QAbstractItemView, QCheckBox,
     QMenu, QAction, QTabWidget, QInputDialog, QProgressDialog, QFrame, QDialog, QSpacerItem, QSizePolicy,
-    QTableWidget, QTableWidgetItem, QTableView, QTreeView, QMenuBar
+    QTableWidget, QTableWidgetItem, QTableView, QTreeView, QMenuBar, QShortcut
 )
-from PyQt5.QtCore import Qt, QEvent, QItemSelectionModel, QUrl, QMimeData, QTimer, QByteArray, QSortFilterProxyModel
+from PyQt5.QtCore import Qt, QEvent, QItemSelectionModel, QUrl, QMimeData, QTimer, QByteArray, QSortFilterProxyModel, QSignalBlocker
 from PyQt5.QtGui import (
     QDrag, QPixmap, QColor, QFont, QDragEnterEvent, QDropEvent, QDesktopServices, QKeySequence
 )
@@ -19,14 +23,15 @@ from mod_manager.utils import (
     get_game_path, SETTINGS_PATH, get_esp_folder, DATA_DIR, open_folder_in_explorer,
     guess_install_type, set_install_type, load_settings, save_settings,
     get_custom_mod_dir_name, _merge_tree, get_display_info, _display_cache,
-    set_display_info, set_display_info_bulk
+    set_display_info, set_display_info_bulk, set_custom_mod_dir_name
 )
 from mod_manager.utils import get_install_type     # ensure we can detect Steam/GamePass
-from mod_manager.registry import list_esp_files, read_plugins_txt, write_plugins_txt
+from mod_manager.registry import list_esp_files, read_plugins_txt, write_plugins_txt, delete_esp_files
 from mod_manager.pak_manager import (
     list_managed_paks, add_pak, remove_pak, scan_for_installed_paks, 
     reconcile_pak_list, PAK_EXTENSION, RELATED_EXTENSIONS, create_subfolder,
-    activate_pak, deactivate_pak, get_pak_target_dir, get_paks_root_dir, ensure_paks_structure
+    activate_pak, deactivate_pak, get_pak_target_dir, get_paks_root_dir, ensure_paks_structure,
+    managed_pak_index, get_pak
 )
 import json
 import datetime
@@ -62,18 +67,34 @@ DEFAULT_LOAD_ORDER = [
     "AltarDeluxe.esp",
     "AltarESPLocal.esp",
 ]
+# Set view of DEFAULT_LOAD_ORDER for membership checks (the list keeps the order)
+DEFAULT_ESPS = frozenset(DEFAULT_LOAD_ORDER)
 
-EXCLUDED_ESPS = [
+EXCLUDED_ESPS = frozenset([
     'AltarGymNavigation.esp',
     'TamrielLeveledRegion.esp',
-]
+])
+
+# Static context-menu labels shared by the ESP/PAK/MagicLoader trees
+MENU_RENAME_DISPLAY = "Rename Display Name…"
+MENU_SET_GROUP = "Set Group…"
+MENU_SET_GROUP_BULK = "Set Group… (bulk)"
+
+
+def _plural(n, suffix='s'):
+    """Return *suffix* unless *n* is exactly one."""
+    return suffix if n != 1 else ''
 
 from ui.install_type_dialog import InstallTypeDialog
-from mod_manager.ue4ss_installer import ensure_ue4ss_configs
+from mod_manager.ue4ss_installer import (
+    ensure_ue4ss_configs, ue4ss_installed, install_ue4ss, uninstall_ue4ss,
+    add_ue4ss_mod, get_ue4ss_bin_dir, get_ue4ss_mods_dir,
+    read_ue4ss_mods_txt, set_ue4ss_mod_enabled
+)
 from ui.jorkTableQT import ModTableModel
 from ui.jorkTreeViewQT import ModTreeModel      # NEW import
 from ui.jorkTreeBrowser import ModTreeBrowser
-from ui.row_builders import rows_from_paks, rows_from_esps
+from ui.row_builders import rows_from_paks, rows_from_esps, rows_from_ue4ss, normalize_subfolder
 # Custom proxy for advanced searching
 from ui.jorkTreeBrowser import ModFilterProxy
 # NEW: MagicLoader helpers
@@ -81,7 +102,8 @@ from mod_manager.magicloader_installer import (
     magicloader_installed, install_magicloader, uninstall_magicloader,
     reenable_magicloader, get_ml_mods_dir, list_ml_json_mods,
     deactivate_ml_mod, activate_ml_mod, get_magicloader_dir, _target_ml_dir,
-    bulk_activate_ml_mods, bulk_deactivate_ml_mods, reload_ml_config
+    bulk_activate_ml_mods, bulk_deactivate_ml_mods, reload_ml_config,
+    get_disabled_ml_mods_dir
 )
 from ui.row_builders import rows_from_magic
 # NEW: OBSE64 helpers
@@ -94,6 +116,24 @@ from ui.row_builders import rows_from_obse64_plugins
 # NEW: Undo system
 from ui.undo_system import UndoStack, UndoAction, ToggleModAction, RenameAction, GroupChangeAction, FileOperationAction, StateSnapshot, PakToggleAction, LoadOrderAction, BulkToggleAction, MagicLoaderBulkToggleAction
 
+logger = logging.getLogger(__name__)
+
+
+def _deferrable_refresh(method):
+    """Make a MainWindow refresh method a no-op while refreshes are suspended.
+
+    The call is remembered and replayed once when the outermost
+    ``_suspend_refresh()`` block exits.
+    """
+    @functools.wraps(method)
+    def wrapper(self):
+        if self._refresh_suspend_depth > 0:
+            if method.__name__ not in self._pending_refreshes:
+                self._pending_refreshes.append(method.__name__)
+            return None
+        return method(self)
+    return wrapper
+
 class PluginsListWidget(QListWidget):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -178,6 +218,11 @@ class MainWindow(QWidget):
 
         # Initialize undo system
         self.undo_stack = UndoStack()
+
+        # Refresh coalescing for bulk operations (see _suspend_refresh)
+        self._refresh_suspend_depth = 0
+        self._pending_refreshes = []
+        self.undo_stack.set_transaction_context(self._suspend_refresh)
         
         # Create menu bar
         self.menu_bar = QMenuBar(self)
@@ -286,7 +331,6 @@ class MainWindow(QWidget):
         self.disabled_mods_label.setStyleSheet("font-weight: bold; color: #ff9800;")
         self.disabled_mods_label.setAlignment(Qt.AlignCenter)
         self.esp_layout.addWidget(self.disabled_mods_label)
-        from ui.row_builders import rows_from_esps
         self.esp_disabled_view = ModTreeBrowser([], search_box=self.esp_search,
                                                show_real_cb=self.chk_real_esp.isChecked, parent=self)
         self.esp_layout.addWidget(self.esp_disabled_view)
@@ -417,7 +461,6 @@ QTreeView::item:selected {
             lambda pos: self._show_esp_context_menu(pos, False))
 
         # Add keyboard shortcuts for ESP bulk operations - QKeySequence already imported at top
-        from PyQt5.QtWidgets import QShortcut
         
         # Ctrl+E: Enable selected ESPs
         enable_shortcut = QShortcut(QKeySequence("Ctrl+E"), self.esp_frame)
@@ -530,11 +573,9 @@ QTreeView::item:selected {
 
         # Attach delete-callback for MagicLoader ModTreeBrowsers
         def _delete_magic_rows(rows):
-            for rd in rows:
-                try:
-                    self._remove_magic_mod(rd["real"])
-                except Exception as e:
-                    print(f"[MAGIC-DEL] error: {e}")
+            removed, failed = self._remove_magic_mods_bulk([rd["real"] for rd in rows])
+            for mod_name, error in failed:
+                print(f"[MAGIC-DEL] error: {mod_name}: {error or 'not found'}")
 
         self.magic_enabled_view.set_delete_callback(_delete_magic_rows)
         self.magic_disabled_view.set_delete_callback(_delete_magic_rows)
@@ -546,6 +587,11 @@ QTreeView::item:selected {
             lambda pos: self._show_magic_context_menu(pos, True))
         self.magic_disabled_view.customContextMenuRequested.connect(
             lambda pos: self._show_magic_context_menu(pos, False))
+        # One reusable set of menus per view; texts are updated on each right-click
+        self._magic_ctx_menus = {
+            True: self._build_magic_context_menus(),
+            False: self._build_magic_context_menus(),
+        }
 
         # Apply consistent tree styling as in PAK tab
         tree_stylesheet = """
@@ -618,7 +664,6 @@ QTreeView::item:selected {
         self.ue4ss_disabled_label.setStyleSheet("font-weight: bold; color: #ff9800;")
         self.ue4ss_disabled_label.setAlignment(Qt.AlignCenter)
         self.ue4ss_layout.addWidget(self.ue4ss_disabled_label)
-        from ui.row_builders import rows_from_ue4ss
         self.ue4ss_disabled_view = ModTreeBrowser([], search_box=self.ue4ss_search,
                                                  show_real_cb=self.chk_real_ue4ss.isChecked, parent=self)
         self.ue4ss_layout.addWidget(self.ue4ss_disabled_view)
@@ -698,7 +743,6 @@ QTreeView::item:selected {
         self.obse64_disabled_label.setStyleSheet("font-weight: bold; color: #ff9800;")
         self.obse64_disabled_label.setAlignment(Qt.AlignCenter)
         self.obse64_layout.addWidget(self.obse64_disabled_label)
-        from ui.row_builders import rows_from_obse64_plugins
         self.obse64_disabled_view = ModTreeBrowser([], search_box=self.obse64_search,
                                                   show_real_cb=self.chk_real_obse64.isChecked, parent=self)
         self.obse64_layout.addWidget(self.obse64_disabled_view)
@@ -1237,7 +1281,6 @@ QTreeView::item:selected {
             force_subfolder: If provided, use this as the subfolder for all PAKs
         """
         # --- ~mods and LogicMods merge logic ---
-        from mod_manager.pak_manager import get_paks_root_dir, ensure_paks_structure, reconcile_pak_list
         ensure_paks_structure(self.game_path)
         paks_root = get_paks_root_dir(self.game_path)
         # Merge ~mods from archive if present
@@ -1361,7 +1404,7 @@ QTreeView::item:selected {
                 shutil.copy2(esp_path, dest_path)
                 
                 # Update plugins.txt - add to the list of ESPs to enable
-                if not esp_name in DEFAULT_LOAD_ORDER and not esp_name in EXCLUDED_ESPS:
+                if not esp_name in DEFAULT_ESPS and not esp_name in EXCLUDED_ESPS:
                     installed_esp_names.append(esp_name)
                 
                 installed_esp += 1
@@ -1399,7 +1442,6 @@ QTreeView::item:selected {
         # --- Install detected UE4SS mods ---
         installed_ue4ss = 0
         if ue4ss_mod_folders:
-            from mod_manager.ue4ss_installer import add_ue4ss_mod, ue4ss_installed
             ok, _ = ue4ss_installed(self.game_path)
             if not ok:
                 self.show_status("UE4SS not installed – skipping UE4SS mods.", 6000, "warning")
@@ -1411,7 +1453,6 @@ QTreeView::item:selected {
         # --- Merge any shared resource folders ---
         installed_shared = 0  # Count installed shared resources
         if shared_mod_folders:
-            from mod_manager.ue4ss_installer import get_ue4ss_mods_dir
             shared_dest_root = get_ue4ss_mods_dir(self.game_path)
             if shared_dest_root:
                 shared_dest = shared_dest_root / "shared"
@@ -1455,8 +1496,6 @@ QTreeView::item:selected {
 
         installed_ml = 0
         if magic_dirs:
-            from mod_manager.magicloader_installer import get_disabled_ml_mods_dir
-            import shutil
             dest_root = get_disabled_ml_mods_dir(self.game_path)
             os.makedirs(dest_root, exist_ok=True)
 
@@ -1526,7 +1565,7 @@ QTreeView::item:selected {
         esp_name = current_item.text()
         
         # Don't show context menu for default ESPs
-        if esp_name in DEFAULT_LOAD_ORDER:
+        if esp_name in DEFAULT_ESPS:
             return
             
         # Create context menu
@@ -1685,21 +1724,21 @@ QTreeView::item:selected {
         # Connect preserve load order checkbox to save settings
         self.preserve_load_order.stateChanged.connect(self._save_preserve_load_order_setting)
 
+    @_deferrable_refresh
     def refresh_lists(self):
         # short‑circuit when load‑order mode is active
         if getattr(self, "load_order_mode", None) and self.load_order_mode.isChecked():
             self._populate_flat_lists()
             return
-        from ui.row_builders import rows_from_esps
         esp_files = list_esp_files()
         if self.hide_stock_checkbox.isChecked():
             # Exclude default ESPs when checkbox is ON
-            mod_esps = [esp for esp in esp_files if esp not in DEFAULT_LOAD_ORDER and esp not in EXCLUDED_ESPS]
+            mod_esps = [esp for esp in esp_files if esp not in DEFAULT_ESPS and esp not in EXCLUDED_ESPS]
             default_esps = []
         else:
             # Include default ESPs (they'll always be treated as enabled)
             mod_esps = [esp for esp in esp_files if esp not in EXCLUDED_ESPS]
-            default_esps = [esp for esp in esp_files if esp in DEFAULT_LOAD_ORDER]
+            default_esps = [esp for esp in esp_files if esp in DEFAULT_ESPS]
         plugins_lines = read_plugins_txt()
         enabled_mods = []
         disabled_mods = []
@@ -1742,7 +1781,7 @@ QTreeView::item:selected {
     def disable_mod(self, item):
         esp = item.text()
         # Don't allow deactivating default ESPs
-        if esp in DEFAULT_LOAD_ORDER:
+        if esp in DEFAULT_ESPS:
             self.show_status("Default ESPs cannot be deactivated as they are required for the game.", 6000, "warning")
             return
             
@@ -1769,7 +1808,7 @@ QTreeView::item:selected {
         new_plugins = DEFAULT_LOAD_ORDER.copy()
         # Find extras in the current UI list (not in default, not excluded, not empty)
         current_plugins = [self.enabled_mods_list.item(i).text().lstrip('#').strip() for i in range(self.enabled_mods_list.count()) if self.enabled_mods_list.item(i).text().lstrip('#').strip() not in EXCLUDED_ESPS]
-        extras = [p for p in current_plugins if p and p not in DEFAULT_LOAD_ORDER]
+        extras = [p for p in current_plugins if p and p not in DEFAULT_ESPS]
         for extra in extras:
             new_plugins.append(f'#{extra}')
         
@@ -1791,11 +1830,11 @@ QTreeView::item:selected {
             self.show_status("Error: Failed to revert load order.", 5000, "error")
         self.refresh_lists()
 
+    @_deferrable_refresh
     def _load_pak_list(self):
         """Load the list of managed PAK mods into the enabled/disabled tables."""
         if not self.game_path:
             return
-        from mod_manager.utils import get_display_info
 
         reconcile_pak_list(self.game_path)
         pak_mods = list_managed_paks()
@@ -1829,10 +1868,7 @@ QTreeView::item:selected {
 
         # ── 2) (Re)build row‑dicts with **display** + **group** information ──
         cache = _display_cache()                                       # O(1) lookup
-        def normalize_cb(subfolder):
-            import re
-            return re.sub(r'^(DisabledMods[\\/]+)', '', subfolder, flags=re.IGNORECASE)
-        all_rows = rows_from_paks(pak_mods, cache, normalize_cb)
+        all_rows = rows_from_paks(pak_mods, cache, normalize_subfolder)
         enabled_rows = [row for row in all_rows if row["active"]]
         disabled_rows = [row for row in all_rows if not row["active"]]
         # Define the color scheme for trees
@@ -2000,6 +2036,19 @@ QTreeView::item:selected {
         self.show_status(f"Deactivated PAK mod: {pak_info['name']}", 3000, "success")
         self._print_model_relationships("After _deactivate_pak_view_row -> undo toggle")
 
+    def _selected_source_indexes(self, view, view_model, clicked_src_index) -> list:
+        """Map the view's selected rows to source indexes in one pass,
+        adding the clicked row if it isn't part of the selection."""
+        sel_indexes = view.selectionModel().selectedRows()
+        if isinstance(view_model, QSortFilterProxyModel):
+            map_to_source = view_model.mapToSource
+            src_indexes = [map_to_source(i) for i in sel_indexes]
+        else:
+            src_indexes = list(sel_indexes)
+        if clicked_src_index not in src_indexes:
+            src_indexes.append(clicked_src_index)
+        return src_indexes
+
     def _show_pak_view_context_menu(self, pos, enabled):
         """
         Context‑menu handler for both enabled/disabled PAK trees.
@@ -2027,10 +2076,8 @@ QTreeView::item:selected {
         if not node:
             return
 
-        from PyQt5.QtWidgets import QMenu, QAction, QInputDialog, QMessageBox
-
         # ========== GROUP HEADER CONTEXT MENU ==========
-        if getattr(node, "is_group", False):
+        if node.is_group:
             group_name = node.data
             context_menu = QMenu(self)
             
@@ -2059,9 +2106,7 @@ QTreeView::item:selected {
                     new_group = text.strip()
                     # Update all PAK mods in this group to the new group name
                     paks_in_group = self._get_paks_in_group(group_name)
-                    from mod_manager.utils import set_display_info
-                    for pak_id in paks_in_group:
-                        set_display_info(pak_id, group=new_group)
+                    set_display_info_bulk([(pak_id, new_group) for pak_id in paks_in_group])
                     self._load_pak_list()
                     self.show_status(f"Renamed group '{group_name}' to '{new_group}'.", 4000, "success")
                     
@@ -2076,17 +2121,15 @@ QTreeView::item:selected {
 
         # ========== INDIVIDUAL PAK CONTEXT MENU ==========
         # Get all selected items (including the clicked one if not selected)
-        sel_indexes = view.selectionModel().selectedRows()
-        if src_index not in [view_model.mapToSource(i) if isinstance(view_model, QSortFilterProxyModel) else i for i in sel_indexes]:
-            sel_indexes.append(index)
+        src_indexes = self._selected_source_indexes(view, view_model, src_index)
 
         # Build list of PAK IDs from selected leaf nodes
         pak_ids = []
-        for idx in sel_indexes:
-            src_index = view_model.mapToSource(idx) if isinstance(view_model, QSortFilterProxyModel) else idx
+        append = pak_ids.append
+        for src_index in src_indexes:
             n = src_index.internalPointer()
-            if n and not getattr(n, "is_group", False):
-                pak_ids.append(n.data["id"])
+            if n is not None and not n.is_group:
+                append(n.data["id"])
 
         if not pak_ids:
             return  # No valid PAKs selected
@@ -2098,13 +2141,13 @@ QTreeView::item:selected {
         if enabled:
             # In enabled view, offer deactivate action
             deactivate_action = context_menu.addAction(
-                f"Deactivate Selected PAK{'s' if many else ''} ({len(pak_ids)})" if many 
+                f"Deactivate Selected PAKs ({len(pak_ids)})" if many 
                 else f"Deactivate {pak_ids[0].split('|')[-1]}"
             )
         else:
             # In disabled view, offer activate action
             activate_action = context_menu.addAction(
-                f"Activate Selected PAK{'s' if many else ''} ({len(pak_ids)})" if many 
+                f"Activate Selected PAKs ({len(pak_ids)})" if many 
                 else f"Activate {pak_ids[0].split('|')[-1]}"
             )
         
@@ -2113,10 +2156,10 @@ QTreeView::item:selected {
         # Standard actions (only for single selection)
         rename_action = None
         if not many:
-            rename_action = context_menu.addAction("Rename Display Name…")
+            rename_action = context_menu.addAction(MENU_RENAME_DISPLAY)
             
-        group_action = context_menu.addAction("Set Group…" + (" (bulk)" if many else ""))
-        delete_action = context_menu.addAction("Delete PAK Mod" + ("s" if many else ""))
+        group_action = context_menu.addAction(MENU_SET_GROUP_BULK if many else MENU_SET_GROUP)
+        delete_action = context_menu.addAction(f"Delete PAK Mod{_plural(len(pak_ids))}")
         
         action = context_menu.exec_(view.viewport().mapToGlobal(pos))
         
@@ -2130,7 +2173,6 @@ QTreeView::item:selected {
         elif action == rename_action and not many:
             # Handle single PAK rename
             pak_id = pak_ids[0]
-            from mod_manager.utils import get_display_info, set_display_info
             current_text = get_display_info(pak_id).get("display", pak_id.split('|')[-1])
             
             text, ok = QInputDialog.getText(
@@ -2142,7 +2184,7 @@ QTreeView::item:selected {
                     # Build set of existing display names (to avoid duplicates)
                     existing = {
                         get_display_info(leaf.data["id"]).get("display", leaf.data["real"]).strip().lower()
-                        for leaf in _iter_leaf_nodes(model.root)
+                        for leaf in model.leaves
                         if isinstance(leaf.data, dict) and "id" in leaf.data
                     }
                     existing.discard(current_text.strip().lower())
@@ -2158,7 +2200,6 @@ QTreeView::item:selected {
                     
         elif action == group_action:
             # Handle group assignment (bulk or single)
-            from mod_manager.utils import get_display_info, set_display_info, set_display_info_bulk
             first_pak_id = pak_ids[0]
             current_group = get_display_info(first_pak_id).get("group", "")
             
@@ -2182,17 +2223,8 @@ QTreeView::item:selected {
             # Handle delete (bulk or single)
             if many:
                 # Get pak_info objects for all selected PAKs
-                pak_infos = []
-                for pak_id in pak_ids:
-                    # Find the pak_info for each pak_id
-                    from mod_manager.pak_manager import list_managed_paks
-                    all_paks = list_managed_paks()
-                    for pak in all_paks:
-                        pak_subfolder = pak.get('subfolder', '') or ''
-                        reconstructed_id = f"{pak_subfolder}|{pak['name']}"
-                        if reconstructed_id == pak_id:
-                            pak_infos.append(pak)
-                            break
+                pak_index = managed_pak_index()
+                pak_infos = [dict(pak_index[pak_id]) for pak_id in pak_ids if pak_id in pak_index]
                 
                 reply = QMessageBox.question(
                     self,
@@ -2205,34 +2237,25 @@ QTreeView::item:selected {
                 
                 if reply == QMessageBox.Yes:
                     deleted_count = 0
-                    for pak_info in pak_infos:
-                        try:
-                            self.delete_pak_mod(pak_info)
-                            deleted_count += 1
-                        except Exception as e:
-                            print(f"[PAK-DEL] Failed to delete {pak_info['name']}: {e}")
+                    with self._suspend_refresh():
+                        for pak_info in pak_infos:
+                            try:
+                                self.delete_pak_mod(pak_info)
+                                deleted_count += 1
+                            except Exception as e:
+                                print(f"[PAK-DEL] Failed to delete {pak_info['name']}: {e}")
                     
                     if deleted_count > 0:
-                        self.show_status(f"Deleted {deleted_count} PAK mod{'s' if deleted_count != 1 else ''}.", 4000, "success")
+                        self.show_status(f"Deleted {deleted_count} PAK mod{_plural(deleted_count)}.", 4000, "success")
             else:
                 # Single PAK delete - get pak_info and call existing delete method
                 pak_id = pak_ids[0]
-                from mod_manager.pak_manager import list_managed_paks
-                all_paks = list_managed_paks()
-                pak_info = None
-                for pak in all_paks:
-                    pak_subfolder = pak.get('subfolder', '') or ''
-                    reconstructed_id = f"{pak_subfolder}|{pak['name']}"
-                    if reconstructed_id == pak_id:
-                        pak_info = pak
-                        break
+                pak_info = get_pak(pak_id, fallback_by_name=False)
                 
                 if pak_info:
                     self.delete_pak_mod(pak_info)
 
     def delete_pak_mod(self, pak_info):
-        from PyQt5.QtWidgets import QMessageBox
-        from mod_manager.pak_manager import remove_pak
         reply = QMessageBox.question(
             self,
             "Confirm Deletion",
@@ -2379,7 +2402,7 @@ QTreeView::item:selected {
             for i in range(self.enabled_mods_list.count()):
                 item_text = self.enabled_mods_list.item(i).text()
                 name = item_text.lstrip('#').strip()
-                if name not in DEFAULT_LOAD_ORDER and name not in EXCLUDED_ESPS:
+                if name not in DEFAULT_ESPS and name not in EXCLUDED_ESPS:
                     user_mods_in_list.append(item_text)
             new_order.extend(user_mods_in_list)
         else:
@@ -2395,7 +2418,7 @@ QTreeView::item:selected {
         enabled_set = set([x.lstrip('#').strip() for x in new_order])
         for line in plugins_lines:
             name = line.lstrip('#').strip()
-            if name not in DEFAULT_LOAD_ORDER and name not in EXCLUDED_ESPS and name not in enabled_set:
+            if name not in DEFAULT_ESPS and name not in EXCLUDED_ESPS and name not in enabled_set:
                 new_order.append(line)
         write_plugins_txt(new_order)
         self.show_status("Load order updated.", 2000, "success")
@@ -2426,7 +2449,6 @@ QTreeView::item:selected {
 
             # 2️⃣ fall back to the expected target dir (steam vs gamepass)
             if not ml_path:
-                from pathlib import Path
                 ml_path = _target_ml_dir(Path(self.game_path), get_install_type() or "steam")
 
             if ml_path and os.path.isdir(ml_path):
@@ -2434,7 +2456,6 @@ QTreeView::item:selected {
             else:
                 self.show_status("MagicLoader folder not found.", 4000, "error")
         elif current_index == 3:  # UE4SS tab
-            from mod_manager.ue4ss_installer import get_ue4ss_bin_dir
             ue4ss_folder = get_ue4ss_bin_dir(self.game_path)
             if ue4ss_folder and os.path.isdir(ue4ss_folder):
                 open_folder_in_explorer(ue4ss_folder)
@@ -2473,9 +2494,8 @@ QTreeView::item:selected {
         self._install_extracted_mod(temp_dir, mod_name, force_subfolder=force_subfolder)
         shutil.rmtree(temp_dir, ignore_errors=True)
 
+    @_deferrable_refresh
     def _refresh_ue4ss_status(self):
-        from mod_manager.ue4ss_installer import ue4ss_installed, get_ue4ss_bin_dir, read_ue4ss_mods_txt
-        import os
         if not self.game_path:
             self.ue4ss_status.setText("No game path set.")
             self.ue4ss_enabled_view.clear()
@@ -2491,7 +2511,6 @@ QTreeView::item:selected {
         sentinel = "; Built-in keybinds, do not move up!"
         enabled = [mod for mod in enabled if mod not in default_mods and mod != sentinel]
         disabled = [mod for mod in disabled if mod not in default_mods and mod != sentinel]
-        from ui.row_builders import rows_from_ue4ss
         rows = rows_from_ue4ss(enabled, disabled)
         enabled_rows = [r for r in rows if r["active"]]
         disabled_rows = [r for r in rows if not r["active"]]
@@ -2529,25 +2548,19 @@ QTreeView::item:selected {
         self._update_ue4ss_btns()
 
     def enable_ue4ss_mod(self, item):
-        from mod_manager.ue4ss_installer import set_ue4ss_mod_enabled
         mod = item.text()
         set_ue4ss_mod_enabled(self.game_path, mod, True)
         self._refresh_ue4ss_status()
 
     def disable_ue4ss_mod(self, item):
-        from mod_manager.ue4ss_installer import set_ue4ss_mod_enabled
         mod = item.text()
         set_ue4ss_mod_enabled(self.game_path, mod, False)
         self._refresh_ue4ss_status()
 
     def _install_update_ue4ss(self):
-        from mod_manager.ue4ss_installer import install_ue4ss
-        from mod_manager.utils import get_install_type, DATA_DIR
-        import os, shutil
         # Check for disabled UE4SS
         disabled_dir = DATA_DIR / "disabled_ue4ss"
         if (disabled_dir / "dwmapi.dll").exists() or (disabled_dir / "UE4SS").exists():
-            from PyQt5.QtWidgets import QMessageBox
             reply = QMessageBox.warning(
                 self,
                 "Warning: Disabled UE4SS Present",
@@ -2587,11 +2600,9 @@ QTreeView::item:selected {
         self._refresh_ue4ss_status()
 
     def _uninstall_ue4ss(self):
-        from mod_manager.ue4ss_installer import uninstall_ue4ss
         if not self.game_path:
             self.show_status("Set game path first.", 6000, "error")
             return
-        from PyQt5.QtWidgets import QMessageBox
         reply = QMessageBox.warning(
             self,
             "Uninstall UE4SS",
@@ -2622,9 +2633,6 @@ QTreeView::item:selected {
         context_menu.exec_(sender.mapToGlobal(position))
 
     def _remove_ue4ss_mod(self, mod_name):
-        from mod_manager.ue4ss_installer import get_ue4ss_mods_dir
-        import shutil
-        from PyQt5.QtWidgets import QMessageBox
         mods_dir = get_ue4ss_mods_dir(self.game_path)
         mod_path = mods_dir / mod_name if mods_dir else None
         if not mod_path or not mod_path.exists():
@@ -2642,7 +2650,6 @@ QTreeView::item:selected {
         try:
             shutil.rmtree(mod_path)
             # Remove from mods.txt
-            from mod_manager.ue4ss_installer import get_ue4ss_bin_dir
             bin_dir = get_ue4ss_bin_dir(self.game_path)
             mods_file = bin_dir / "UE4SS" / "Mods" / "mods.txt" if bin_dir else None
             if mods_file and mods_file.exists():
@@ -2666,9 +2673,6 @@ QTreeView::item:selected {
                 )
 
     def _toggle_ue4ss_enabled(self):
-        from mod_manager.ue4ss_installer import get_ue4ss_bin_dir
-        from mod_manager.utils import DATA_DIR
-        import shutil, os
         bin_dir = get_ue4ss_bin_dir(self.game_path)
         disabled_dir = DATA_DIR / "disabled_ue4ss"
         dll_disabled = disabled_dir / "dwmapi.dll"
@@ -2699,13 +2703,11 @@ QTreeView::item:selected {
         self._update_ue4ss_btns()
 
     def _update_ue4ss_btns(self):
-        from mod_manager.ue4ss_installer import ue4ss_installed
         ok, _ = ue4ss_installed(self.game_path)
         if ok:
             self.ue4ss_action_btn.setText("Uninstall UE4SS")
         else:
             self.ue4ss_action_btn.setText("Install UE4SS")
-        from mod_manager.utils import DATA_DIR
         disabled_dir = DATA_DIR / "disabled_ue4ss"
         dll_disabled = disabled_dir / "dwmapi.dll"
         ue4ss_disabled = disabled_dir / "UE4SS"
@@ -2715,9 +2717,6 @@ QTreeView::item:selected {
             self.ue4ss_disable_btn.setText("Disable UE4SS")
 
     def _disable_ue4ss(self):
-        from mod_manager.ue4ss_installer import get_ue4ss_bin_dir
-        from mod_manager.utils import DATA_DIR
-        import shutil, os
         bin_dir = get_ue4ss_bin_dir(self.game_path)
         if not bin_dir:
             self.show_status("UE4SS not found to disable.", 5000, "error")
@@ -2747,7 +2746,6 @@ QTreeView::item:selected {
         self._refresh_ue4ss_status()
 
     def _on_ue4ss_action(self):
-        from mod_manager.ue4ss_installer import ue4ss_installed
         ok, _ = ue4ss_installed(self.game_path)
         if ok:
             self._uninstall_ue4ss()
@@ -2770,29 +2768,28 @@ QTreeView::item:selected {
     def _save_custom_mod_dir(self):
         name = self.mod_dir_edit.text().strip()
         try:
-            from mod_manager.utils import set_custom_mod_dir_name
             old = get_custom_mod_dir_name()
             set_custom_mod_dir_name(name)
             # Prompt for migration if old dir exists and is different
-            from mod_manager.pak_manager import get_paks_root_dir
             old_dir = os.path.join(get_paks_root_dir(self.game_path), old)
             new_dir = os.path.join(get_paks_root_dir(self.game_path), name)
+            note = f"(Existing files stay in '{old}')."
             if os.path.isdir(old_dir) and old != name:
                 dlg = MigrateModsDialog(old_dir, new_dir, self)
                 if dlg.exec_() == QDialog.Accepted:
-                    moved = migrate_mods(old_dir, new_dir, self)
-                    self.show_status(f"Moved {moved} files from '{old}' to '{name}'.", 6000, "success")
+                    moved, renamed = migrate_mods(old_dir, new_dir, self)
+                    if renamed:
+                        note = f"('{old}' was renamed to it, {moved} files included)."
+                    else:
+                        note = f"(Moved {moved} files from '{old}')."
             ensure_paks_structure(self.game_path)         # recreate folder if missing
-            self.show_status(
-                f"Custom mod folder set to '{name}'. (Existing files stay in '{old}').",
-                6000, "success")
+            self.show_status(f"Custom mod folder set to '{name}'. {note}", 6000, "success")
             self._load_pak_list()
         except ValueError:
             self.show_status("Folder name invalid or reserved.", 5000, "error")
 
     def _browse_mod_dir_name(self):
         # Let user pick a folder, but only use the folder name
-        from mod_manager.pak_manager import get_paks_root_dir
         base_dir = None
         if self.game_path:
             paks_root = get_paks_root_dir(self.game_path)
@@ -2853,12 +2850,12 @@ QTreeView::item:selected {
         esp_files = list_esp_files()
         if self.hide_stock_checkbox.isChecked():
             # Exclude default ESPs when checkbox is ON
-            mod_esps = [esp for esp in esp_files if esp not in DEFAULT_LOAD_ORDER and esp not in EXCLUDED_ESPS]
+            mod_esps = [esp for esp in esp_files if esp not in DEFAULT_ESPS and esp not in EXCLUDED_ESPS]
             default_esps = []
         else:
             # Include default ESPs (they'll always be treated as enabled)
             mod_esps = [esp for esp in esp_files if esp not in EXCLUDED_ESPS]
-            default_esps = [esp for esp in esp_files if esp in DEFAULT_LOAD_ORDER]
+            default_esps = [esp for esp in esp_files if esp in DEFAULT_ESPS]
         for line in read_plugins_txt():
             name = line.lstrip('#').strip()
             if name in mod_esps:
@@ -2884,8 +2881,9 @@ QTreeView::item:selected {
             # Preserve load order mode: modify in-place if ESP exists
             esp_found = False
             for i, line in enumerate(plugins):
-                clean_name = line.lstrip('#').strip()
-                if clean_name == esp_name:
+                if not line.endswith(esp_name):
+                    continue
+                if line.lstrip('#').strip() == esp_name:
                     # Found ESP, modify in-place
                     plugins[i] = esp_name if enabled else f'#{esp_name}'
                     esp_found = True
@@ -2896,7 +2894,7 @@ QTreeView::item:selected {
                 plugins.append(esp_name if enabled else f'#{esp_name}')
         else:
             # Legacy mode: remove and append (current behavior)
-            plugins = [p for p in plugins if p.lstrip('#').strip() != esp_name]
+            plugins = [p for p in plugins if not p.endswith(esp_name) or p.lstrip('#').strip() != esp_name]
             plugins.append(esp_name if enabled else f'#{esp_name}')
         
         write_plugins_txt(plugins)
@@ -2911,7 +2909,7 @@ QTreeView::item:selected {
     def _deactivate_esp_row(self, index):
         src = self.esp_enabled_view._proxy.mapToSource(index)
         node = src.internalPointer()
-        if node and not node.is_group and node.data["real"] not in DEFAULT_LOAD_ORDER:
+        if node and not node.is_group and node.data["real"] not in DEFAULT_ESPS:
             esp_name = node.data["real"]
             self._toggle_esp_with_undo(esp_name, False)
 
@@ -2926,6 +2924,7 @@ QTreeView::item:selected {
     # --------------------------------------------------------------------------
     # MagicLoader helpers
     # --------------------------------------------------------------------------
+    @_deferrable_refresh
     def _refresh_magic_status(self):
         if not self.game_path:
             self.magic_status.setText("No game path set.")
@@ -2937,7 +2936,6 @@ QTreeView::item:selected {
         else:
             msg = "MagicLoader not installed."
 
-        from mod_manager.magicloader_installer import list_ml_json_mods
         enabled, disabled = list_ml_json_mods(self.game_path)
 
         rows = rows_from_magic(enabled, disabled)
@@ -3009,7 +3007,6 @@ QTreeView::item:selected {
         """
         Show info box: open Nexus page or browse for already‑downloaded archive.
         """
-        from PyQt5.QtWidgets import QMessageBox, QFileDialog
         url = "https://www.nexusmods.com/oblivionremastered/mods/1966?tab=description"
 
         box = QMessageBox(self)
@@ -3048,7 +3045,6 @@ QTreeView::item:selected {
         self._refresh_magic_status()
 
     def _toggle_magic_enabled(self):
-        from mod_manager.utils import DATA_DIR
         disabled_root = Path(DATA_DIR)/"disabled_magicloader"/"MagicLoader"
         ok, _ = magicloader_installed(self.game_path)
         if ok:
@@ -3073,9 +3069,6 @@ QTreeView::item:selected {
     # Launch MagicLoader executable
     # ------------------------------------------------------------------
     def _launch_magicloader(self):
-        from mod_manager.magicloader_installer import get_magicloader_dir
-        import os
-
         ml_dir = get_magicloader_dir(self.game_path)
         if not ml_dir:
             self.show_status("MagicLoader not installed.", 4000, "error")
@@ -3094,6 +3087,7 @@ QTreeView::item:selected {
     # OBSE64 Methods
     # -------------------------------------------------------------------------
 
+    @_deferrable_refresh
     def _refresh_obse64_status(self):
         """Refresh OBSE64 status and plugin lists."""
         if not self.game_path:
@@ -3158,7 +3152,6 @@ QTreeView::item:selected {
         is_installed, version_or_error = obse64_installed(self.game_path)
         
         # Check if we have disabled OBSE64 backup
-        from mod_manager.utils import DATA_DIR
         disabled_dir = DATA_DIR / "disabled_obse64"
         has_disabled = disabled_dir.exists() and any(disabled_dir.glob("obse64_*"))
         
@@ -3190,7 +3183,6 @@ QTreeView::item:selected {
             self._uninstall_obse64()
         else:
             # Check if we have disabled backup to re-enable
-            from mod_manager.utils import DATA_DIR
             disabled_dir = DATA_DIR / "disabled_obse64"
             if disabled_dir.exists() and any(disabled_dir.glob("obse64_*")):
                 self._reenable_obse64()
@@ -3209,10 +3201,8 @@ QTreeView::item:selected {
             return
         
         # Check Steam restriction first
-        from mod_manager.utils import get_install_type
         install_type = get_install_type()
         if install_type != "steam":
-            from PyQt5.QtWidgets import QMessageBox
             QMessageBox.warning(
                 self,
                 "OBSE64 Not Supported",
@@ -3267,7 +3257,6 @@ QTreeView::item:selected {
 
     def _uninstall_obse64(self):
         """Uninstall OBSE64 (move to disabled folder)."""
-        from PyQt5.QtWidgets import QMessageBox
         
         reply = QMessageBox.warning(
             self,
@@ -3344,7 +3333,6 @@ QTreeView::item:selected {
 
     def _remove_obse64_plugin(self, plugin_name):
         """Remove OBSE64 plugin permanently."""
-        from PyQt5.QtWidgets import QMessageBox
         
         reply = QMessageBox.question(
             self,
@@ -3403,13 +3391,32 @@ QTreeView::item:selected {
         """Create a group change action for the undo system.""" 
         return GroupChangeAction(mod_id, old_group, new_group, group_callback, refresh_callback)
         
+    @contextmanager
+    def _suspend_refresh(self):
+        """Coalesce list refreshes requested inside the block into one refresh each on exit."""
+        self._refresh_suspend_depth += 1
+        try:
+            yield
+        finally:
+            self._refresh_suspend_depth -= 1
+            if self._refresh_suspend_depth == 0 and self._pending_refreshes:
+                pending, self._pending_refreshes = self._pending_refreshes, []
+                for name in pending:
+                    # A failing refresh must not skip the others or escape into
+                    # UndoStack.push/undo/redo, which report failure as False
+                    try:
+                        getattr(self, name)()
+                    except Exception:
+                        logger.exception('deferred %s failed', name)
+
     def _execute_with_undo(self, action: UndoAction) -> bool:
         """Execute an action and add it to the undo stack."""
-        print(f'[UNDO-DEBUG] _execute_with_undo called with action: {action.description}')
+        logger.debug('_execute_with_undo: %s', action)
+        if action.is_noop:
+            # Nothing would change - don't run callbacks or record an undo step
+            return False
         result = self.undo_stack.push(action)
-        print(f'[UNDO-DEBUG] undo_stack.push returned: {result}')
-        print(f'[UNDO-DEBUG] undo_stack.can_undo: {self.undo_stack.can_undo()}')
-        print(f'[UNDO-DEBUG] undo_stack actions count: {len(self.undo_stack.actions)}')
+        logger.debug('_execute_with_undo: push returned %s', result)
         return result
 
     # =============================================================================
@@ -3418,27 +3425,12 @@ QTreeView::item:selected {
     
     def _toggle_pak_with_undo(self, pak_id: str, enable: bool):
         """Toggle PAK mod with undo support."""
-        print(f'[UNDO-DEBUG] _toggle_pak_with_undo called: pak_id={pak_id}, enable={enable}')
-        # Get current state and pak_info
-        from mod_manager.pak_manager import list_managed_paks
-        all_paks = list_managed_paks()
-        
-        # Find current state by reconstructing the ID from pak data
-        current_state = False
-        
-        for pak in all_paks:
-            # Reconstruct the pak_id from pak data: "subfolder|name"
-            pak_subfolder = pak.get('subfolder', '') or ''
-            reconstructed_id = f"{pak_subfolder}|{pak['name']}"
-            
-            if reconstructed_id == pak_id:
-                current_state = pak.get('active', False)
-                break
-        
-        print(f'[UNDO-DEBUG] current_state: {current_state}, desired state: {enable}')
+        # Find current state by the "subfolder|name" pak_id
+        pak = managed_pak_index().get(pak_id)
+        current_state = pak.get('active', False) if pak else False
+        logger.debug('_toggle_pak_with_undo: %s %s -> %s', pak_id, current_state, enable)
         
         if current_state == enable:
-            print(f'[UNDO-DEBUG] Already in desired state, returning early')
             return  # Already in desired state
             
         # Use special PAK action that looks up fresh pak_info at execution time
@@ -3446,7 +3438,6 @@ QTreeView::item:selected {
             pak_id, current_state, enable, 
             self.game_path, self._load_pak_list
         )
-        print(f'[UNDO-DEBUG] Created PakToggleAction: {action.description}')
         self._execute_with_undo(action)
         
     def _toggle_esp_with_undo(self, esp_name: str, enable: bool):
@@ -3455,10 +3446,13 @@ QTreeView::item:selected {
         plugins_lines = read_plugins_txt()
         current_state = False
         
-        # Check if the ESP is currently enabled (uncommented in plugins.txt)
+        # Check if the ESP is currently enabled (uncommented in plugins.txt).
+        # Lines come back stripped, so a suffix miss rules a line out before
+        # building its cleaned copy.
         for line in plugins_lines:
-            clean_name = line.lstrip('#').strip()
-            if clean_name == esp_name:
+            if not line.endswith(esp_name):
+                continue
+            if line.lstrip('#').strip() == esp_name:
                 current_state = not line.startswith('#')  # enabled if not commented
                 break
         
@@ -3480,20 +3474,18 @@ QTreeView::item:selected {
         if not esp_names:
             return
             
-        # Get current states for all ESPs
+        # Get current states for all ESPs; ESPs not in plugins.txt are considered disabled
         plugins_lines = read_plugins_txt()
-        esp_states = {}
+        esp_names_set = set(esp_names)
+        esp_states = dict.fromkeys(esp_names, False)
         
         # Build current state map
         for line in plugins_lines:
-            clean_name = line.lstrip('#').strip()
-            if clean_name in esp_names:
-                esp_states[clean_name] = not line.startswith('#')  # enabled if not commented
-        
-        # ESPs not in plugins.txt are considered disabled
-        for esp_name in esp_names:
-            if esp_name not in esp_states:
-                esp_states[esp_name] = False
+            # Enabled lines are already the bare name; only commented ones need cleaning
+            commented = line.startswith('#')
+            clean_name = line.lstrip('#').strip() if commented else line
+            if clean_name in esp_names_set:
+                esp_states[clean_name] = not commented  # enabled if not commented
         
         # Build list of changes needed
         changes = []
@@ -3542,7 +3534,7 @@ QTreeView::item:selected {
         # Get all ESPs in the specified group, excluding default ESPs
         esp_names = self._get_esps_in_group(group_name)
         # Filter out default ESPs that cannot be disabled
-        esp_names = [esp for esp in esp_names if esp not in DEFAULT_LOAD_ORDER]
+        esp_names = [esp for esp in esp_names if esp not in DEFAULT_ESPS]
         
         if esp_names:
             self._bulk_toggle_esps_with_undo(esp_names, False)
@@ -3551,7 +3543,6 @@ QTreeView::item:selected {
 
     def _get_esps_in_group(self, group_name: str) -> list:
         """Get all ESP names that belong to a specific group."""
-        from mod_manager.utils import get_display_info
         
         # Get all ESP files and check their group assignments
         esp_files = list_esp_files()
@@ -3574,7 +3565,6 @@ QTreeView::item:selected {
 
     def _toggle_ue4ss_with_undo(self, mod_name: str, enable: bool):
         """Toggle UE4SS mod with undo support.""" 
-        from mod_manager.ue4ss_installer import read_ue4ss_mods_txt
         
         # Get current state from mods.txt file, not folder existence
         enabled_mods, disabled_mods = read_ue4ss_mods_txt(self.game_path)
@@ -3585,7 +3575,6 @@ QTreeView::item:selected {
             
         # Create toggle action
         def toggle_callback(mod_id, new_state):
-            from mod_manager.ue4ss_installer import set_ue4ss_mod_enabled
             set_ue4ss_mod_enabled(self.game_path, mod_id, new_state)
             
         action = self._create_toggle_action(
@@ -3596,17 +3585,15 @@ QTreeView::item:selected {
         
     def _toggle_magic_with_undo(self, mod_name: str, enable: bool):
         """Toggle MagicLoader mod with undo support."""
-        from mod_manager.magicloader_installer import list_ml_json_mods
         
         enabled_mods, disabled_mods = list_ml_json_mods(self.game_path)
-        current_state = any(m == mod_name for m in enabled_mods)
+        current_state = mod_name in enabled_mods
         
         if current_state == enable:
             return  # Already in desired state
             
         # Create toggle action
         def toggle_callback(mod_id, new_state):
-            from mod_manager.magicloader_installer import activate_ml_mod, deactivate_ml_mod
             if new_state:
                 activate_ml_mod(self.game_path, mod_id)
             else:
@@ -3621,7 +3608,7 @@ QTreeView::item:selected {
     def _toggle_obse64_with_undo(self, plugin_name: str, enable: bool):
         """Toggle OBSE64 plugin with undo support."""
         enabled_plugins, disabled_plugins = list_obse_plugins(self.game_path)
-        current_state = any(p == plugin_name for p in enabled_plugins)
+        current_state = plugin_name in enabled_plugins
         
         if current_state == enable:
             return  # Already in desired state
@@ -3675,14 +3662,16 @@ QTreeView::item:selected {
         )
         self._execute_with_undo(action)
         
-    def _set_load_order_from_list(self, order_list: list):
-        """Set the load order from a list of mod names and update plugins.txt."""
-        # Clear the current list
-        self.enabled_mods_list.clear()
-        
-        # Add items in the specified order
-        for item_text in order_list:
-            self.enabled_mods_list.addItem(item_text)
+    def _set_load_order_from_list(self, order_list):
+        """Set the load order from a sequence of mod names and update plugins.txt."""
+        # Rebuild the list in one call with the widget's own signals blocked;
+        # the view still repaints from the underlying model.
+        blocker = QSignalBlocker(self.enabled_mods_list)
+        try:
+            self.enabled_mods_list.clear()
+            self.enabled_mods_list.addItems(order_list)
+        finally:
+            blocker.unblock()
         
         # Update plugins.txt to match the new order
         self.update_plugins_txt_from_enabled_list()
@@ -3714,10 +3703,8 @@ QTreeView::item:selected {
         if not node:
             return
 
-        from PyQt5.QtWidgets import QMenu, QAction, QInputDialog, QMessageBox
-
         # ========== GROUP HEADER CONTEXT MENU ==========
-        if getattr(node, "is_group", False):
+        if node.is_group:
             group_name = node.data
             context_menu = QMenu(self)
             
@@ -3746,9 +3733,7 @@ QTreeView::item:selected {
                     new_group = text.strip()
                     # Update all ESPs in this group to the new group name
                     esps_in_group = self._get_esps_in_group(group_name)
-                    from mod_manager.utils import set_display_info
-                    for esp_name in esps_in_group:
-                        set_display_info(f"|{esp_name}", group=new_group)
+                    set_display_info_bulk([(f"|{esp_name}", new_group) for esp_name in esps_in_group])
                     self.refresh_lists()
                     self.show_status(f"Renamed group '{group_name}' to '{new_group}'.", 4000, "success")
                     
@@ -3763,20 +3748,18 @@ QTreeView::item:selected {
 
         # ========== INDIVIDUAL ESP CONTEXT MENU ==========
         # Get all selected items (including the clicked one if not selected)
-        sel_indexes = view.selectionModel().selectedRows()
-        if src_idx not in [view._proxy.mapToSource(i) for i in sel_indexes]:
-            sel_indexes.append(index)
+        src_indexes = self._selected_source_indexes(view, view._proxy, src_idx)
 
         # Build list of ESP names from selected leaf nodes
         esp_names = []
-        for idx in sel_indexes:
-            src_index = view._proxy.mapToSource(idx)
+        append = esp_names.append
+        for src_index in src_indexes:
             n = src_index.internalPointer()
-            if n and not getattr(n, "is_group", False):
+            if n is not None and not n.is_group:
                 esp_name = n.data["real"]
                 # Don't allow operations on default ESPs
-                if esp_name not in DEFAULT_LOAD_ORDER:
-                    esp_names.append(esp_name)
+                if esp_name not in DEFAULT_ESPS:
+                    append(esp_name)
 
         if not esp_names:
             return  # No valid ESPs selected
@@ -3788,13 +3771,13 @@ QTreeView::item:selected {
         if enabled_view:
             # In enabled view, offer disable action
             disable_action = context_menu.addAction(
-                f"Disable Selected ESP{'s' if many else ''} ({len(esp_names)})" if many 
+                f"Disable Selected ESPs ({len(esp_names)})" if many 
                 else f"Disable {esp_names[0]}"
             )
         else:
             # In disabled view, offer enable action
             enable_action = context_menu.addAction(
-                f"Enable Selected ESP{'s' if many else ''} ({len(esp_names)})" if many 
+                f"Enable Selected ESPs ({len(esp_names)})" if many 
                 else f"Enable {esp_names[0]}"
             )
         
@@ -3803,10 +3786,10 @@ QTreeView::item:selected {
         # Standard actions (only for single selection)
         rename_action = None
         if not many:
-            rename_action = context_menu.addAction("Rename Display Name…")
+            rename_action = context_menu.addAction(MENU_RENAME_DISPLAY)
             
-        group_action = context_menu.addAction("Set Group…" + (" (bulk)" if many else ""))
-        delete_action = context_menu.addAction("Delete ESP File" + ("s" if many else ""))
+        group_action = context_menu.addAction(MENU_SET_GROUP_BULK if many else MENU_SET_GROUP)
+        delete_action = context_menu.addAction(f"Delete ESP File{_plural(len(esp_names))}")
         
         action = context_menu.exec_(view.viewport().mapToGlobal(pos))
         
@@ -3820,7 +3803,6 @@ QTreeView::item:selected {
         elif action == rename_action and not many:
             # Handle single ESP rename
             esp_name = esp_names[0]
-            from mod_manager.utils import get_display_info, set_display_info
             esp_id = f"|{esp_name}"  # Use correct ID format
             current_text = get_display_info(esp_id).get("display", esp_name)
             
@@ -3836,7 +3818,6 @@ QTreeView::item:selected {
                     
         elif action == group_action:
             # Handle group assignment (bulk or single)
-            from mod_manager.utils import get_display_info, set_display_info, set_display_info_bulk
             first_esp = esp_names[0]
             first_esp_id = f"|{first_esp}"  # Use correct ID format
             current_group = get_display_info(first_esp_id).get("group", "")
@@ -3878,18 +3859,17 @@ QTreeView::item:selected {
                 )
                 
             if reply == QMessageBox.Yes:
-                # Delete all selected ESP files
-                deleted_count = 0
-                for esp_name in esp_names:
-                    try:
-                        self.delete_esp_file(esp_name)
-                        deleted_count += 1
-                    except Exception as e:
-                        print(f"[ESP-DEL] Failed to delete {esp_name}: {e}")
+                # Delete all selected ESP files with one plugins.txt rewrite
+                deleted, failed = delete_esp_files(esp_names)
+                for esp_name, error in failed:
+                    print(f"[ESP-DEL] Failed to delete {esp_name}: {error}")
                 
+                deleted_count = len(deleted)
                 if deleted_count > 0:
-                    self.show_status(f"Deleted {deleted_count} ESP file{'s' if deleted_count != 1 else ''}.", 4000, "success")
-                    self.refresh_lists()
+                    self.show_status(f"Deleted {deleted_count} ESP file{_plural(deleted_count)}.", 4000, "success")
+                elif failed:
+                    self.show_status(f"Failed to delete {failed[0][0]}: {failed[0][1]}", 10000, "error")
+                self.refresh_lists()
 
     def _enable_selected_esps(self):
         """Enable all currently selected ESPs via keyboard shortcut (Ctrl+E)."""
@@ -3918,7 +3898,7 @@ QTreeView::item:selected {
             view = self.esp_enabled_view
             esp_names = self._get_selected_esp_names(view)
             # Filter out default ESPs that cannot be disabled
-            esp_names = [esp for esp in esp_names if esp not in DEFAULT_LOAD_ORDER]
+            esp_names = [esp for esp in esp_names if esp not in DEFAULT_ESPS]
             if esp_names:
                 self._bulk_toggle_esps_with_undo(esp_names, False)
             else:
@@ -3935,22 +3915,19 @@ QTreeView::item:selected {
 
     def _get_selected_esp_names(self, view) -> list:
         """Get ESP names from currently selected items in the given view."""
+        # Bind lookups once; _Node always defines is_group
+        map_to_source = view._proxy.mapToSource
         esp_names = []
-        sel_indexes = view.selectionModel().selectedRows()
-        
-        for index in sel_indexes:
-            src_index = view._proxy.mapToSource(index)
-            node = src_index.internalPointer()
-            if node and not getattr(node, "is_group", False):
-                esp_name = node.data["real"]
-                esp_names.append(esp_name)
+        append = esp_names.append
+        for index in view.selectionModel().selectedRows():
+            node = map_to_source(index).internalPointer()
+            if node is not None and not node.is_group:
+                append(node.data["real"])
         
         return esp_names
 
     def _get_paks_in_group(self, group_name: str) -> list:
         """Get all PAK IDs that belong to a specific group."""
-        from mod_manager.utils import get_display_info
-        from mod_manager.pak_manager import list_managed_paks
         
         # Get all PAK files and check their group assignments
         all_paks = list_managed_paks()
@@ -3994,21 +3971,13 @@ QTreeView::item:selected {
             return
             
         # Get current states for all PAKs
-        from mod_manager.pak_manager import list_managed_paks, activate_pak, deactivate_pak
-        all_paks = list_managed_paks()
-        pak_states = {}
-        
-        # Build current state map
-        for pak in all_paks:
-            pak_subfolder = pak.get('subfolder', '') or ''
-            reconstructed_id = f"{pak_subfolder}|{pak['name']}"
-            if reconstructed_id in pak_ids:
-                pak_states[reconstructed_id] = pak.get('active', False)
+        pak_index = managed_pak_index()
         
         # Build list of changes needed
         changes = []
         for pak_id in pak_ids:
-            current_state = pak_states.get(pak_id, False)
+            pak = pak_index.get(pak_id)
+            current_state = pak.get('active', False) if pak else False
             if current_state != activate:
                 changes.append((pak_id, current_state, activate))
         
@@ -4018,19 +3987,18 @@ QTreeView::item:selected {
             self.show_status(f"All selected PAK mods are already {action_word}.", 3000, "info")
             return
         
-        # Create bulk toggle action with proper PAK toggle callback
+        # Create bulk toggle action with proper PAK toggle callback.
+        # Look the pak up on every call: each toggle rewrites pak_mods.json, and
+        # the index is only rebuilt after such a change, so a rollback never
+        # sees pak_info from before the toggles it is reverting.
         def toggle_callback(pak_id, new_state):
-            # Find the pak_info for this pak_id
-            all_paks = list_managed_paks()
-            for pak in all_paks:
-                pak_subfolder = pak.get('subfolder', '') or ''
-                reconstructed_id = f"{pak_subfolder}|{pak['name']}"
-                if reconstructed_id == pak_id:
-                    if new_state:
-                        activate_pak(self.game_path, pak)
-                    else:
-                        deactivate_pak(self.game_path, pak)
-                    break
+            pak = get_pak(pak_id, fallback_by_name=False)
+            if pak is None:
+                return
+            if new_state:
+                activate_pak(self.game_path, pak)
+            else:
+                deactivate_pak(self.game_path, pak)
             
         action = BulkToggleAction(
             changes, "PAK", toggle_callback, self._load_pak_list
@@ -4050,8 +4018,6 @@ QTreeView::item:selected {
 
     def _get_magic_mods_in_group(self, group_name: str) -> list:
         """Get all MagicLoader JSON mod names that belong to a specific group."""
-        from mod_manager.utils import get_display_info
-        from mod_manager.magicloader_installer import list_ml_json_mods
         
         # Get all MagicLoader JSON files and check their group assignments
         enabled_mods, disabled_mods = list_ml_json_mods(self.game_path)
@@ -4094,13 +4060,13 @@ QTreeView::item:selected {
             return
             
         # Get current states for all mods
-        from mod_manager.magicloader_installer import list_ml_json_mods
         enabled_mods, disabled_mods = list_ml_json_mods(self.game_path)
+        enabled_set = set(enabled_mods)
         
         # Build list of changes needed
         changes = []
         for mod_name in mod_names:
-            current_state = mod_name in enabled_mods
+            current_state = mod_name in enabled_set
             if current_state != activate:
                 changes.append((mod_name, current_state, activate))
         
@@ -4110,17 +4076,7 @@ QTreeView::item:selected {
             self.show_status(f"All selected MagicLoader mods are already {action_word}.", 3000, "info")
             return
         
-        # Create bulk toggle action with proper MagicLoader batching
-        def toggle_callback(mod_id, new_state):
-            # This callback will be called for individual items in bulk operations
-            # We don't call the CLI here since we'll batch everything
-            from mod_manager.magicloader_installer import activate_ml_mod, deactivate_ml_mod
-            if new_state:
-                activate_ml_mod(self.game_path, mod_id)
-            else:
-                deactivate_ml_mod(self.game_path, mod_id)
-        
-        # Special MagicLoader bulk action that handles CLI batching
+        # Special MagicLoader bulk action that moves all JSONs, then reloads the CLI once
         action = MagicLoaderBulkToggleAction(
             changes, self.game_path, self._refresh_magic_status
         )
@@ -4137,6 +4093,26 @@ QTreeView::item:selected {
             else:
                 self.show_status(f"Deactivated {deactivate_count} MagicLoader mods.", 4000, "success")
 
+    def _build_magic_context_menus(self) -> dict:
+        """Create the reusable group-header and mod menus for one MagicLoader view."""
+        group_menu = QMenu(self)
+        rename_group = group_menu.addAction("Rename Group")
+        group_menu.addSeparator()
+        group_toggle = group_menu.addAction("")
+        
+        mod_menu = QMenu(self)
+        toggle = mod_menu.addAction("")
+        mod_menu.addSeparator()
+        rename = mod_menu.addAction(MENU_RENAME_DISPLAY)
+        set_group = mod_menu.addAction(MENU_SET_GROUP)
+        delete = mod_menu.addAction("")
+        
+        return {
+            "group_menu": group_menu, "rename_group": rename_group, "group_toggle": group_toggle,
+            "mod_menu": mod_menu, "toggle": toggle, "rename": rename,
+            "set_group": set_group, "delete": delete,
+        }
+
     def _show_magic_context_menu(self, pos, enabled: bool):
         """Context menu handler for both enabled/disabled MagicLoader trees."""
         # ----- figure out which view the user clicked in -----
@@ -4159,28 +4135,21 @@ QTreeView::item:selected {
         if not node:
             return
 
-        from PyQt5.QtWidgets import QMenu, QAction, QInputDialog, QMessageBox
+        menus = self._magic_ctx_menus[enabled]
 
         # ========== GROUP HEADER CONTEXT MENU ==========
-        if getattr(node, "is_group", False):
+        if node.is_group:
             group_name = node.data
-            context_menu = QMenu(self)
-            
-            # Group rename action
-            rename_group_action = context_menu.addAction("Rename Group")
-            context_menu.addSeparator()
+            rename_group_action = menus["rename_group"]
             
-            # Group enable/disable actions - show appropriate action based on view
-            if enabled:
-                # In enabled view, offer deactivate action for the group
-                deactivate_group_action = context_menu.addAction(f"Deactivate All in '{group_name}'")
-                group_action = deactivate_group_action
-            else:
-                # In disabled view, offer activate action for the group
-                activate_group_action = context_menu.addAction(f"Activate All in '{group_name}'")
-                group_action = activate_group_action
+            # Group enable/disable action - deactivate in the enabled view, activate in the disabled one
+            group_action = menus["group_toggle"]
+            group_action.setText(
+                f"Deactivate All in '{group_name}'" if enabled
+                else f"Activate All in '{group_name}'"
+            )
             
-            action = context_menu.exec_(view.viewport().mapToGlobal(pos))
+            action = menus["group_menu"].exec_(view.viewport().mapToGlobal(pos))
             
             if action == rename_group_action:
                 # Handle group rename
@@ -4191,9 +4160,7 @@ QTreeView::item:selected {
                     new_group = text.strip()
                     # Update all MagicLoader mods in this group to the new group name
                     mods_in_group = self._get_magic_mods_in_group(group_name)
-                    from mod_manager.utils import set_display_info
-                    for mod_name in mods_in_group:
-                        set_display_info(f"|{mod_name}", group=new_group)
+                    set_display_info_bulk([(f"|{mod_name}", new_group) for mod_name in mods_in_group])
                     self._refresh_magic_status()
                     self.show_status(f"Renamed group '{group_name}' to '{new_group}'.", 4000, "success")
                     
@@ -4208,62 +4175,48 @@ QTreeView::item:selected {
 
         # ========== INDIVIDUAL MAGICLOADER MOD CONTEXT MENU ==========
         # Get all selected items (including the clicked one if not selected)
-        sel_indexes = view.selectionModel().selectedRows()
-        if src_index not in [view_model.mapToSource(i) if isinstance(view_model, QSortFilterProxyModel) else i for i in sel_indexes]:
-            sel_indexes.append(index)
+        src_indexes = self._selected_source_indexes(view, view_model, src_index)
 
-        # Build list of mod names from selected leaf nodes
+        # Build lists of mod names and their "|name" display ids from selected leaf nodes
         mod_names = []
-        for idx in sel_indexes:
-            src_index = view_model.mapToSource(idx) if isinstance(view_model, QSortFilterProxyModel) else idx
+        mod_ids = []
+        for src_index in src_indexes:
             n = src_index.internalPointer()
-            if n and not getattr(n, "is_group", False):
+            if n is not None and not n.is_group:
                 mod_names.append(n.data["real"])
+                mod_ids.append(n.data["id"])
 
         if not mod_names:
             return  # No valid mods selected
 
         many = len(mod_names) > 1
-        context_menu = QMenu(self)
         
-        # Enable/Disable actions
-        if enabled:
-            # In enabled view, offer deactivate action
-            deactivate_action = context_menu.addAction(
-                f"Deactivate Selected Mod{'s' if many else ''} ({len(mod_names)})" if many 
-                else f"Deactivate {mod_names[0]}"
-            )
-        else:
-            # In disabled view, offer activate action
-            activate_action = context_menu.addAction(
-                f"Activate Selected Mod{'s' if many else ''} ({len(mod_names)})" if many 
-                else f"Activate {mod_names[0]}"
-            )
-        
-        context_menu.addSeparator()
+        # Enable/Disable action - deactivate in the enabled view, activate in the disabled one
+        verb = "Deactivate" if enabled else "Activate"
+        toggle_action = menus["toggle"]
+        toggle_action.setText(
+            f"{verb} Selected Mods ({len(mod_names)})" if many
+            else f"{verb} {mod_names[0]}"
+        )
         
-        # Standard actions (only for single selection)
-        rename_action = None
-        if not many:
-            rename_action = context_menu.addAction("Rename Display Name…")
-            
-        group_action = context_menu.addAction("Set Group…" + (" (bulk)" if many else ""))
-        delete_action = context_menu.addAction("Delete JSON Mod" + ("s" if many else ""))
+        # Standard actions (rename only for single selection)
+        rename_action = menus["rename"]
+        rename_action.setVisible(not many)
+        group_action = menus["set_group"]
+        group_action.setText(MENU_SET_GROUP_BULK if many else MENU_SET_GROUP)
+        delete_action = menus["delete"]
+        delete_action.setText(f"Delete JSON Mod{_plural(len(mod_names))}")
         
-        action = context_menu.exec_(view.viewport().mapToGlobal(pos))
+        action = menus["mod_menu"].exec_(view.viewport().mapToGlobal(pos))
         
         # Handle actions
-        if enabled and action == deactivate_action:
-            self._bulk_toggle_magic_mods_with_undo(mod_names, False)
-            
-        elif not enabled and action == activate_action:
-            self._bulk_toggle_magic_mods_with_undo(mod_names, True)
+        if action == toggle_action:
+            self._bulk_toggle_magic_mods_with_undo(mod_names, not enabled)
             
         elif action == rename_action and not many:
             # Handle single mod rename
             mod_name = mod_names[0]
-            from mod_manager.utils import get_display_info, set_display_info
-            mod_id = f"|{mod_name}"
+            mod_id = mod_ids[0]
             current_text = get_display_info(mod_id).get("display", mod_name)
             
             text, ok = QInputDialog.getText(
@@ -4278,8 +4231,7 @@ QTreeView::item:selected {
                     
         elif action == group_action:
             # Handle group assignment (bulk or single)
-            from mod_manager.utils import get_display_info, set_display_info, set_display_info_bulk
-            first_mod_id = f"|{mod_names[0]}"
+            first_mod_id = mod_ids[0]
             current_group = get_display_info(first_mod_id).get("group", "")
             
             text, ok = QInputDialog.getText(
@@ -4289,7 +4241,7 @@ QTreeView::item:selected {
                 group_val = text.strip()
                 if many:
                     # Bulk group change
-                    changes = [(f"|{mod_name}", group_val) for mod_name in mod_names]
+                    changes = [(mod_id, group_val) for mod_id in mod_ids]
                     set_display_info_bulk(changes)
                     self.show_status(f"Set group for {len(mod_names)} MagicLoader mods to '{group_val}'.", 4000, "success")
                 else:
@@ -4311,17 +4263,13 @@ QTreeView::item:selected {
                 )
                 
                 if reply == QMessageBox.Yes:
-                    deleted_count = 0
-                    for mod_name in mod_names:
-                        try:
-                            self._remove_magic_mod(mod_name)
-                            deleted_count += 1
-                        except Exception as e:
-                            print(f"[MAGIC-DEL] Failed to delete {mod_name}: {e}")
+                    removed, failed = self._remove_magic_mods_bulk(mod_names)
+                    for mod_name, error in failed:
+                        print(f"[MAGIC-DEL] Failed to delete {mod_name}: {error or 'not found'}")
                     
+                    deleted_count = len(removed)
                     if deleted_count > 0:
-                        self.show_status(f"Deleted {deleted_count} MagicLoader mod{'s' if deleted_count != 1 else ''}.", 4000, "success")
-                        self._refresh_magic_status()
+                        self.show_status(f"Deleted {deleted_count} MagicLoader mod{_plural(deleted_count)}.", 4000, "success")
             else:
                 # Single mod delete
                 mod_name = mod_names[0]
@@ -4338,46 +4286,59 @@ QTreeView::item:selected {
 
     def _remove_magic_mod(self, mod_name: str):
         """Remove MagicLoader JSON mod permanently."""
-        from mod_manager.magicloader_installer import get_ml_mods_dir, get_disabled_ml_mods_dir
+        removed, failed = self._remove_magic_mods_bulk([mod_name])
+        if removed:
+            self.show_status(f"MagicLoader mod '{mod_name}' was deleted successfully.", 4000, "success")
+        elif failed:
+            error = failed[0][1]
+            if error is None:
+                self.show_status(f"MagicLoader mod '{mod_name}' not found.", 6000, "error")
+            else:
+                self.show_status(f"Failed to delete MagicLoader mod '{mod_name}': {error}", 8000, "error")
+
+    def _remove_magic_mods_bulk(self, mod_names: list) -> tuple:
+        """Remove MagicLoader JSON mods permanently, reloading the CLI once.
         
+        Returns (removed, failed); failed holds (mod_name, error) pairs where
+        error is None when the mod was in neither folder.
+        """
         enabled_dir = get_ml_mods_dir(self.game_path)
         disabled_dir = get_disabled_ml_mods_dir(self.game_path)
         
         if not enabled_dir or not disabled_dir:
             self.show_status("MagicLoader directories not found.", 6000, "error")
-            return
+            return [], []
         
-        # Check both enabled and disabled locations
-        enabled_path = enabled_dir / mod_name
-        disabled_path = disabled_dir / mod_name
+        # List both locations once instead of two exists() calls per mod
+        enabled_present = set(os.listdir(enabled_dir))
+        disabled_present = set(os.listdir(disabled_dir))
         
-        try:
-            removed = False
-            if enabled_path.exists():
-                enabled_path.unlink()
-                removed = True
-            if disabled_path.exists():
-                disabled_path.unlink()
-                removed = True
-            
-            if removed:
-                # Call CLI to reload configuration after deletion
-                from mod_manager.magicloader_installer import reload_ml_config
-                reload_ml_config(self.game_path)
-                self.show_status(f"MagicLoader mod '{mod_name}' was deleted successfully.", 4000, "success")
-                self._refresh_magic_status()
+        removed, failed = [], []
+        for mod_name in mod_names:
+            try:
+                found = False
+                if mod_name in enabled_present:
+                    (enabled_dir / mod_name).unlink()
+                    found = True
+                if mod_name in disabled_present:
+                    (disabled_dir / mod_name).unlink()
+                    found = True
+            except Exception as e:
+                failed.append((mod_name, str(e)))
+                continue
+            if found:
+                removed.append(mod_name)
             else:
-                self.show_status(f"MagicLoader mod '{mod_name}' not found.", 6000, "error")
-        except Exception as e:
-            self.show_status(f"Failed to delete MagicLoader mod '{mod_name}': {str(e)}", 8000, "error")
+                failed.append((mod_name, None))
+        
+        if removed:
+            # Call CLI to reload configuration after deletion
+            reload_ml_config(self.game_path)
+            self._refresh_magic_status()
+        return removed, failed
 
     def _install_obse64_from_loose_files(self, obse64_files):
         """Install OBSE64 from a list of loose file paths."""
-        from mod_manager.obse64_installer import install_obse64
-        from mod_manager.utils import get_install_type
-        import tempfile
-        import uuid
-        import shutil
         
         # Check Steam restriction
         install_type = get_install_type()
@@ -4391,12 +4352,16 @@ QTreeView::item:selected {
             os.makedirs(temp_dir, exist_ok=True)
             
             # Copy only the essential OBSE64 files to temp directory (ignore src, readme, etc.)
-            copied_files = []
-            for file_path in obse64_files:
-                filename = os.path.basename(file_path)
-                dest_path = os.path.join(temp_dir, filename)
-                shutil.copy2(file_path, dest_path)
-                copied_files.append(filename)
+            # One source per file name (a later duplicate wins, as with sequential
+            # copies), so the parallel copies never share a destination
+            sources = {os.path.basename(p): p for p in obse64_files}
+            copied_files = list(sources)
+            with ThreadPoolExecutor(max_workers=min(8, len(sources) or 1)) as pool:
+                # list() re-raises the first copy error, if any
+                list(pool.map(
+                    lambda name: _link_or_copy(sources[name], os.path.join(temp_dir, name)),
+                    copied_files
+                ))
             
             # Use existing installation function
             success, message = install_obse64(self.game_path, temp_dir, None)
@@ -4414,40 +4379,42 @@ QTreeView::item:selected {
                 shutil.rmtree(temp_dir, ignore_errors=True)
 
 
+MIGRATE_DIALOG_QSS = """
+    QDialog {
+        background-color: #232323;
+        color: #e0e0e0;
+        font-family: 'Segoe UI', Arial, sans-serif;
+        font-size: 11pt;
+    }
+    QLabel {
+        color: #e0e0e0;
+    }
+    QPushButton {
+        background-color: #292929;
+        color: #ff9800;
+        border: 1px solid #444;
+        border-radius: 4px;
+        padding: 6px 16px;
+        min-width: 80px;
+    }
+    QPushButton:hover {
+        background-color: #333;
+        color: #fff;
+        border: 1px solid #ff9800;
+    }
+    QPushButton:pressed {
+        background-color: #181818;
+        color: #ff9800;
+    }
+"""
+
 class MigrateModsDialog(QDialog):
     def __init__(self, old_dir, new_dir, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Migrate Mods")
         self.setWindowModality(Qt.WindowModal)
         self.setMinimumWidth(400)
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #232323;
-                color: #e0e0e0;
-                font-family: 'Segoe UI', Arial, sans-serif;
-                font-size: 11pt;
-            }
-            QLabel {
-                color: #e0e0e0;
-            }
-            QPushButton {
-                background-color: #292929;
-                color: #ff9800;
-                border: 1px solid #444;
-                border-radius: 4px;
-                padding: 6px 16px;
-                min-width: 80px;
-            }
-            QPushButton:hover {
-                background-color: #333;
-                color: #fff;
-                border: 1px solid #ff9800;
-            }
-            QPushButton:pressed {
-                background-color: #181818;
-                color: #ff9800;
-            }
-        """)
+        self.setStyleSheet(MIGRATE_DIALOG_QSS)
         layout = QVBoxLayout(self)
         msg = QLabel(f"Move all mods from <b>{old_dir}</b> to <b>{new_dir}</b>?\nThis will preserve all subfolders and files.")
         msg.setWordWrap(True)
@@ -4463,11 +4430,23 @@ class MigrateModsDialog(QDialog):
         layout.addLayout(btn_row)
 
 
+def _link_or_copy(src, dst):
+    """Hardlink *src* to *dst* for read-only staging; copy when linking isn't possible."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        # Cross-device, or the filesystem has no hardlinks
+        shutil.copy2(src, dst)
+
 def migrate_mods(old_dir, new_dir, parent=None):
-    import shutil, os
-    from PyQt5.QtWidgets import QProgressDialog
+    """Move everything under old_dir to new_dir.
+
+    Returns (file_count, renamed): renamed is True when old_dir was renamed
+    as a whole, False when files were moved one by one (some may be left
+    behind if that was cancelled or a move failed).
+    """
     if not os.path.isdir(old_dir):
-        return 0
+        return 0, False
     # Count files to move
     file_list = []
     for root, _, files in os.walk(old_dir):
@@ -4477,35 +4456,104 @@ def migrate_mods(old_dir, new_dir, parent=None):
             dst = os.path.join(new_dir, rel)
             file_list.append((src, dst))
     if not file_list:
-        return 0
+        return 0, False
+    # Same volume and nothing at the destination yet: one directory rename
+    # moves everything at once
+    if not os.path.exists(new_dir):
+        new_parent = os.path.dirname(os.path.abspath(new_dir))
+        try:
+            if os.path.isdir(new_parent) and os.stat(old_dir).st_dev == os.stat(new_parent).st_dev:
+                os.rename(old_dir, new_dir)
+                return len(file_list), True
+        except OSError:
+            pass  # e.g. a file is locked - fall back to moving file by file
     dlg = QProgressDialog("Migrating mods...", "Cancel", 0, len(file_list), parent)
     dlg.setWindowModality(Qt.WindowModal)
     dlg.setMinimumWidth(400)
     dlg.show()
     moved = 0
+    made_dirs = set()
     for i, (src, dst) in enumerate(file_list):
         if dlg.wasCanceled():
             break
         dlg.setValue(i)
         dlg.setLabelText(f"Moving: {os.path.basename(src)}")
-        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        dst_dir = os.path.dirname(dst)
+        if dst_dir not in made_dirs:
+            os.makedirs(dst_dir, exist_ok=True)
+            made_dirs.add(dst_dir)
         try:
             shutil.move(src, dst)
             moved += 1
         except Exception:
             pass
     dlg.setValue(len(file_list))
-    return moved
-
-def _iter_leaf_nodes(node):
-    """Depth‑first generator that yields every leaf (non‑group) node."""
-    stack = [node]
-    while stack:
-        n = stack.pop()
-        if getattr(n, "is_group", False):
-            stack.extend(n.children)
-        else:
-            yield n
+    return moved, False
+
+OBSE64_DIALOG_QSS = """
+    QDialog {
+        background-color: #2b2b2b;
+        color: #e0e0e0;
+    }
+    QLabel {
+        color: #e0e0e0;
+    }
+    QPushButton {
+        background-color: #404040;
+        color: #e0e0e0;
+        border: 1px solid #555;
+        padding: 8px 16px;
+        border-radius: 4px;
+    }
+    QPushButton:hover {
+        background-color: #4a4a4a;
+    }
+    QPushButton:pressed {
+        background-color: #353535;
+    }
+    QLabel#obseTitle {
+        font-size: 16px; font-weight: bold; color: #ff9800; margin-bottom: 10px;
+    }
+    QLabel#obseExplanation {
+        font-size: 13px; margin-bottom: 10px;
+    }
+    QLabel#obseSteps {
+        background-color: #1e1e1e; 
+        border: 1px solid #404040; 
+        border-radius: 6px; 
+        padding: 20px;
+    }
+    QLabel#obseNote {
+        color: #aaa; font-size: 11px; font-style: italic;
+    }
+    QPushButton#obseBrowseBtn {
+        background-color: #ff9800; 
+        color: #000; 
+        font-weight: bold; 
+        padding: 10px 20px;
+        border: none;
+        border-radius: 5px;
+    }
+    QPushButton#obseBrowseBtn:hover {
+        background-color: #ffb74d;
+    }
+    QPushButton#obseBrowseBtn:pressed {
+        background-color: #f57c00;
+    }
+    QPushButton#obseCancelBtn {
+        background-color: #666; 
+        color: white; 
+        padding: 10px 20px;
+        border: none;
+        border-radius: 5px;
+    }
+    QPushButton#obseCancelBtn:hover {
+        background-color: #777;
+    }
+    QPushButton#obseCancelBtn:pressed {
+        background-color: #555;
+    }
+"""
 
 class OBSE64ManualInstallDialog(QDialog):
     def __init__(self, parent=None):
@@ -4514,29 +4562,8 @@ class OBSE64ManualInstallDialog(QDialog):
         self.setFixedSize(580, 460)
         self.setModal(True)
         
-        # Apply dark theme styling
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #2b2b2b;
-                color: #e0e0e0;
-            }
-            QLabel {
-                color: #e0e0e0;
-            }
-            QPushButton {
-                background-color: #404040;
-                color: #e0e0e0;
-                border: 1px solid #555;
-                padding: 8px 16px;
-                border-radius: 4px;
-            }
-            QPushButton:hover {
-                background-color: #4a4a4a;
-            }
-            QPushButton:pressed {
-                background-color: #353535;
-            }
-        """)
+        # Apply dark theme styling (child widgets are styled by object name)
+        self.setStyleSheet(OBSE64_DIALOG_QSS)
         
         # Main layout
         layout = QVBoxLayout(self)
@@ -4544,7 +4571,7 @@ class OBSE64ManualInstallDialog(QDialog):
         
         # Title
         title = QLabel("OBSE64 Manual Installation Required")
-        title.setStyleSheet("font-size: 16px; font-weight: bold; color: #ff9800; margin-bottom: 10px;")
+        title.setObjectName("obseTitle")
         title.setAlignment(Qt.AlignCenter)
         layout.addWidget(title)
         
@@ -4554,17 +4581,12 @@ class OBSE64ManualInstallDialog(QDialog):
             "Please follow these simple steps for installation:"
         )
         explanation.setWordWrap(True)
-        explanation.setStyleSheet("font-size: 13px; margin-bottom: 10px;")
+        explanation.setObjectName("obseExplanation")
         layout.addWidget(explanation)
         
         # Steps container with background
         steps_container = QLabel()
-        steps_container.setStyleSheet("""
-            background-color: #1e1e1e; 
-            border: 1px solid #404040; 
-            border-radius: 6px; 
-            padding: 20px;
-        """)
+        steps_container.setObjectName("obseSteps")
         
         # Steps text with proper formatting
         steps_text = """<div style="line-height: 1.6;">
@@ -4590,7 +4612,7 @@ The OBSE64 archive uses bcj2 compression that requires external tools to extract
         
         # Note about ignoring files
         note = QLabel("<i>Note: You can ignore the 'src' folder and text files - only drag the .exe and .dll files.</i>")
-        note.setStyleSheet("color: #aaa; font-size: 11px; font-style: italic;")
+        note.setObjectName("obseNote")
         note.setWordWrap(True)
         layout.addWidget(note)
         
@@ -4599,39 +4621,10 @@ The OBSE64 archive uses bcj2 compression that requires external tools to extract
         button_layout.setSpacing(10)
         
         self.browse_btn = QPushButton("Continue to Browse Archive")
-        self.browse_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #ff9800; 
-                color: #000; 
-                font-weight: bold; 
-                padding: 10px 20px;
-                border: none;
-                border-radius: 5px;
-            }
-            QPushButton:hover {
-                background-color: #ffb74d;
-            }
-            QPushButton:pressed {
-                background-color: #f57c00;
-            }
-        """)
+        self.browse_btn.setObjectName("obseBrowseBtn")
         
         self.cancel_btn = QPushButton("Cancel")
-        self.cancel_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #666; 
-                color: white; 
-                padding: 10px 20px;
-                border: none;
-                border-radius: 5px;
-            }
-            QPushButton:hover {
-                background-color: #777;
-            }
-            QPushButton:pressed {
-                background-color: #555;
-            }
-        """)
+        self.cancel_btn.setObjectName("obseCancelBtn")
         
         button_layout.addWidget(self.browse_btn)
         button_layout.addWidget(self.cancel_btn)
@@ -3,22 +3,40 @@ Reusable helpers that convert backend objects into the generic
 { id, real, subfolder, … , pak_info } row format expected by ModTreeModel.
 Later we'll add ESP + UE4SS builders.
 """
+import re
+from itertools import chain, repeat
+
+# Leading "DisabledMods" folder (alone or followed by separators), case-insensitive
+_DISABLED_PREFIX_RE = re.compile(r'^DisabledMods(?:[\\/]+|$)', re.IGNORECASE)
+
+def normalize_subfolder(subfolder):
+    """Strip a leading DisabledMods folder so active and inactive ids match."""
+    return _DISABLED_PREFIX_RE.sub('', subfolder, count=1)
+
+_EMPTY = {}   # shared read-only default for rows without display info
+
 def rows_from_paks(pak_mods, display_cache, normalize_cb):
     rows = []
-    import re
-    by_filename = {cid.split('|')[-1]: info for cid, info in display_cache.items()}
+    append = rows.append
+    lookup = display_cache.get
+    by_filename = None   # filename -> info, built only if a prefixed lookup misses
     for pak in pak_mods:
+        name = pak["name"]
         subfolder = pak.get('subfolder', '') or ''
         # Normalize subfolder: strip DisabledMods[\/] prefix if present
         norm_subfolder = normalize_cb(subfolder)
-        norm_mod_id = f"{norm_subfolder}|{pak['name']}"
-        orig_mod_id = f"{subfolder}|{pak['name']}"
+        orig_mod_id = f"{subfolder}|{name}"
         # Try normalized mod_id, then original, then by filename
-        disp_info = display_cache.get(norm_mod_id) or display_cache.get(orig_mod_id) or by_filename.get(pak["name"], {})
-        rows.append({
+        disp_info = (lookup(orig_mod_id) if norm_subfolder == subfolder
+                     else lookup(f"{norm_subfolder}|{name}") or lookup(orig_mod_id))
+        if not disp_info:
+            if by_filename is None:
+                by_filename = {cid.rpartition('|')[2]: info for cid, info in display_cache.items()}
+            disp_info = by_filename.get(name, _EMPTY)
+        append({
             "id":        orig_mod_id,
-            "real":      pak["name"],
-            "display":   disp_info.get("display", pak["name"]),
+            "real":      name,
+            "display":   disp_info.get("display", name),
             "group":     disp_info.get("group", ""),
             "subfolder": pak.get("subfolder"),
             "active":    pak.get("active", True),
@@ -26,59 +44,40 @@ def rows_from_paks(pak_mods, display_cache, normalize_cb):
         })
     return rows
 
+def _with_state(enabled, disabled):
+    """Yield (name, active) for every enabled, then every disabled, entry."""
+    return chain(zip(enabled, repeat(True)), zip(disabled, repeat(False)))
+
 def rows_from_esps(enabled, disabled):
     # return list[dict] mimicking rows_from_paks; group == "" for now
     # id format: f"|{esp_name}"
-    from mod_manager.utils import get_display_info
+    from mod_manager.utils import _display_cache
     
+    cache = _display_cache()   # one dict for the whole build
     rows = []
-    for esp in enabled:
-        display_info = get_display_info(esp)
-        rows.append({
-            "id": f"|{esp}",
-            "real": esp,
-            "display": display_info.get("display", esp),
-            "group": display_info.get("group", ""),
-            "subfolder": None,
-            "active": True,
-            "esp_info": {"name": esp, "enabled": True},
-        })
-    for esp in disabled:
-        display_info = get_display_info(esp)
+    for esp, active in _with_state(enabled, disabled):
+        display_info = cache.get(esp, {})
         rows.append({
             "id": f"|{esp}",
             "real": esp,
             "display": display_info.get("display", esp),
             "group": display_info.get("group", ""),
             "subfolder": None,
-            "active": False,
-            "esp_info": {"name": esp, "enabled": False},
+            "active": active,
+            "esp_info": {"name": esp, "enabled": active},
         })
     return rows
 
 def rows_from_ue4ss(enabled, disabled):
-    rows = []
-    for mod in enabled:
-        rows.append({
-            "id": f"|{mod}",
-            "real": mod,
-            "display": mod,
-            "group": "",
-            "subfolder": None,
-            "active": True,
-            "ue4ss_info": {"name": mod, "enabled": True},
-        })
-    for mod in disabled:
-        rows.append({
-            "id": f"|{mod}",
-            "real": mod,
-            "display": mod,
-            "group": "",
-            "subfolder": None,
-            "active": False,
-            "ue4ss_info": {"name": mod, "enabled": False},
-        })
-    return rows
+    return [{
+        "id": f"|{mod}",
+        "real": mod,
+        "display": mod,
+        "group": "",
+        "subfolder": None,
+        "active": active,
+        "ue4ss_info": {"name": mod, "enabled": active},
+    } for mod, active in _with_state(enabled, disabled)]
 
 # ---------------------------------------------------------------------------
 # MagicLoader JSON rows
@@ -86,30 +85,21 @@ def rows_from_ue4ss(enabled, disabled):
 def rows_from_magic(enabled, disabled):
     # Similar to rows_from_esps - support display names and groups
     # id format: f"|{mod_name}"
-    from mod_manager.utils import get_display_info
+    from mod_manager.utils import _display_cache
     
+    cache = _display_cache()   # one dict for the whole build
     rows = []
-    for mod in enabled:
-        display_info = get_display_info(f"|{mod}")
-        rows.append({
-            "id": f"|{mod}",
-            "real": mod,
-            "display": display_info.get("display", mod),
-            "group": display_info.get("group", ""),
-            "subfolder": None,
-            "active": True,
-            "magic_info": {"name": mod, "enabled": True},
-        })
-    for mod in disabled:
-        display_info = get_display_info(f"|{mod}")
+    for mod, active in _with_state(enabled, disabled):
+        mod_id = f"|{mod}"
+        display_info = cache.get(mod_id, {})
         rows.append({
-            "id": f"|{mod}",
+            "id": mod_id,
             "real": mod,
             "display": display_info.get("display", mod),
             "group": display_info.get("group", ""),
             "subfolder": None,
-            "active": False,
-            "magic_info": {"name": mod, "enabled": False},
+            "active": active,
+            "magic_info": {"name": mod, "enabled": active},
         })
     return rows
 
@@ -120,25 +110,12 @@ def rows_from_obse64_plugins(enabled, disabled):
     """Convert OBSE64 plugin lists to row format for ModTreeBrowser.
     enabled/disabled are lists of .dll plugin filenames.
     """
-    rows = []
-    for plugin in enabled:
-        rows.append({
-            "id": f"|{plugin}",
-            "real": plugin,
-            "display": plugin,
-            "group": "",
-            "subfolder": None,
-            "active": True,
-            "obse64_info": {"name": plugin, "enabled": True},
-        })
-    for plugin in disabled:
-        rows.append({
-            "id": f"|{plugin}",
-            "real": plugin,
-            "display": plugin,
-            "group": "",
-            "subfolder": None,
-            "active": False,
-            "obse64_info": {"name": plugin, "enabled": False},
-        })
-    return rows 
\ No newline at end of file
+    return [{
+        "id": f"|{plugin}",
+        "real": plugin,
+        "display": plugin,
+        "group": "",
+        "subfolder": None,
+        "active": active,
+        "obse64_info": {"name": plugin, "enabled": active},
+    } for plugin, active in _with_state(enabled, disabled)]
@@ -4,18 +4,112 @@ Focuses on reversible actions within the tree views (enable/disable, rename, gro
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Tuple
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from functools import partial
+from itertools import compress
+from operator import itemgetter, ne
+from typing import Any, Deque, Dict, List, Optional, Tuple
+import atexit
 import json
+import logging
+import os
 import shutil
+import tempfile
+import time
+import uuid
 from pathlib import Path
 from PyQt5.QtCore import QObject, pyqtSignal
+from mod_manager.pak_manager import activate_pak, deactivate_pak, get_pak
+
+logger = logging.getLogger(__name__)
+# Per-call debug tracing in hot paths is guarded by ``if __debug__ and ...``:
+# under ``python -O`` the compiler drops those blocks entirely, otherwise they
+# cost one isEnabledFor() check.
+
+# Toggles pushed within this many milliseconds of each other are merged into
+# a single undo step (see UndoAction.coalesce_with).
+COALESCE_MS = 500
+
+# Default cap on the estimated memory held by the undo/redo history
+MAX_UNDO_BYTES = 64 * 1024 * 1024
+
+# Non-JSON files captured by StateSnapshot are copied into a directory of
+# this process's own instead of being held in memory. Copies are deleted as
+# their undo actions are released, and the directory is removed at exit.
+_snapshot_dir: Optional[Path] = None
+
+
+def _acquire_snapshot_path() -> Path:
+    """Return a new path in the snapshot directory, creating it on first use."""
+    global _snapshot_dir
+    if _snapshot_dir is None:
+        _snapshot_dir = Path(tempfile.mkdtemp(prefix='omm_undo_'))
+        atexit.register(shutil.rmtree, _snapshot_dir, True)
+    return _snapshot_dir / uuid.uuid4().hex
+
+
+def _release_snapshot_path(path: Path):
+    """Delete a snapshot file that is no longer needed."""
+    try:
+        path.unlink()
+    except OSError:
+        pass
+
+
+def _count_enabled(changes) -> int:
+    """Count the (id, old_state, new_state) changes that enable a mod."""
+    return sum(map(bool, map(itemgetter(2), changes)))
+
+
+def _safe_call(callback, refresh_callback) -> bool:
+    """Run callback() and then refresh_callback(); False if either raises."""
+    try:
+        callback()
+        refresh_callback()
+        return True
+    except Exception:
+        logger.exception('undo action callback failed')
+        return False
+
+
+def _bulk_desc(total: int, enable_count: int, noun: str) -> str:
+    """Describe a bulk toggle of *total* mods, *enable_count* of them enabled."""
+    disable_count = total - enable_count
+    if enable_count > 0 and disable_count > 0:
+        return f"Bulk Toggle {total} {noun} mods"
+    elif enable_count > 0:
+        return f"Bulk Enable {enable_count} {noun} mods"
+    return f"Bulk Disable {disable_count} {noun} mods"
 
 
 class UndoAction(ABC):
     """Base class for all undoable actions."""
     
-    def __init__(self, description: str):
-        self.description = description
+    __slots__ = ('_description',)
+    
+    # True when executing the action would not change anything; such actions
+    # are dropped instead of being recorded on the undo stack.
+    is_noop = False
+    
+    def __init__(self, description: Optional[str] = None):
+        # None means "build it from _build_description() when first needed"
+        self._description = description
+        
+    @property
+    def description(self) -> str:
+        """Human-readable summary shown in the Undo/Redo menu entries."""
+        if self._description is None:
+            self._description = self._build_description()
+        return self._description
+        
+    @description.setter
+    def description(self, value: str):
+        self._description = value
+        
+    def _build_description(self) -> str:
+        """Return the description for actions created without one."""
+        return type(self).__name__
         
     @abstractmethod
     def execute(self) -> bool:
@@ -27,6 +121,35 @@ class UndoAction(ABC):
         """Undo the action. Return True if successful."""
         pass
         
+    def coalesce_with(self, other: 'UndoAction') -> Optional['UndoAction']:
+        """Return one action covering this action followed by *other*.
+
+        Both actions have already been executed. Return None when they have to
+        stay separate undo steps.
+        """
+        return None
+        
+    def try_merge(self, other: 'UndoAction') -> bool:
+        """Fold *other*, which was just executed, into this action in place.
+
+        Used for repeated toggles of the same target, whatever the time between
+        them. Return True if merged; the stack drops this action if it has
+        become a no-op.
+        """
+        return False
+        
+    def release(self):
+        """Free resources held for undo once the action leaves the stack."""
+        pass
+        
+    def memory_usage(self) -> int:
+        """Rough number of bytes this action keeps alive for undo.
+
+        Only actions carrying sizeable payloads (snapshots, orders, change
+        lists) need to override this; callbacks and short strings are ignored.
+        """
+        return 0
+        
     def __str__(self):
         return self.description
 
@@ -40,115 +163,221 @@ class UndoStack(QObject):
     undoTextChanged = pyqtSignal(str)
     redoTextChanged = pyqtSignal(str)
     
-    def __init__(self, max_actions: int = 50):
+    def __init__(self, max_actions: int = 50, max_bytes: int = MAX_UNDO_BYTES):
         super().__init__()
         self.max_actions = max_actions
-        self.actions: List[UndoAction] = []
-        self.current_index = -1  # Index of last executed action
+        self.max_bytes = max_bytes
+        # Executed actions, newest on the right; appending to a full deque
+        # drops the oldest one
+        self._undo: Deque[UndoAction] = deque(maxlen=max_actions)
+        # Undone actions, next one to redo on the right
+        self._redo: Deque[UndoAction] = deque()
+        # memory_usage() of every action in either deque, taken when it was added
+        self._sizes: Dict[int, int] = {}
+        self._total_bytes = 0
+        self._last_push_time = float('-inf')  # monotonic time of the last push
+        # Last values sent to the UI, so unchanged state isn't re-emitted
+        # (can_undo, can_redo, undo_text, redo_text)
+        self._last_emitted: Tuple[Any, ...] = (None, None, None, None)
+        self._batch_depth = 0
+        self._pending_emit = False  # something changed inside a batched() block
+        # Context wrapped around every execute/undo (see set_transaction_context)
+        self._transaction = nullcontext
+        
+    def set_transaction_context(self, factory):
+        """Run every action's execute/undo inside ``with factory():``.
+
+        The UI uses this to hold back list refreshes until the outermost
+        transaction finishes, so a bulk action rebuilds each view once.
+        """
+        self._transaction = factory
         
     def push(self, action: UndoAction) -> bool:
         """Execute and add an action to the stack."""
-        print(f'[UNDO-STACK] push called with action: {action.description}')
+        logger.debug('push: %s', action)
         # Execute the action first
-        if not action.execute():
-            print(f'[UNDO-STACK] action.execute() failed for: {action.description}')
+        with self._transaction():
+            ok = action.execute()
+        if not ok:
+            logger.warning('push: execute failed for %s', action)
             return False
-            
-        print(f'[UNDO-STACK] action.execute() succeeded for: {action.description}')
         
-        # Remove any actions after current index (redo stack)
-        if self.current_index < len(self.actions) - 1:
-            removed_count = len(self.actions) - self.current_index - 1
-            self.actions = self.actions[:self.current_index + 1]
-            print(f'[UNDO-STACK] Removed {removed_count} redo actions')
+        # A new action invalidates everything that could have been redone
+        if self._redo:
+            logger.debug('push: dropped %d redo actions', len(self._redo))
+            for undone in self._redo:
+                self._on_action_evicted(undone)
+            self._redo.clear()
             
-        # Add new action
-        self.actions.append(action)
-        self.current_index += 1
-        
-        # Limit stack size
-        if len(self.actions) > self.max_actions:
-            self.actions.pop(0)
-            self.current_index -= 1
-            print(f'[UNDO-STACK] Trimmed stack to {self.max_actions} actions')
+        # Toggling the same mod again amends the top action (or cancels it out)
+        if self._undo and self._undo[-1].try_merge(action):
+            top = self._undo[-1]
+            if top.is_noop:
+                logger.debug('push: %s cancelled out', top)
+                self._on_action_evicted(self._undo.pop())
+            else:
+                logger.debug('push: merged into %s', top)
+                self._forget_size(top)
+                self._track_size(top)
+            self._last_push_time = float('-inf')
+            self._emit_signals()
+            return True
+            
+        # Merge rapid consecutive toggles into the action on top of the stack
+        now = time.monotonic()
+        recent = (now - self._last_push_time) * 1000 <= COALESCE_MS
+        self._last_push_time = now
+        if recent and self._undo:
+            merged = self._undo[-1].coalesce_with(action)
+            if merged is not None:
+                self._forget_size(self._undo[-1])
+                self._undo[-1] = merged
+                self._track_size(merged)
+                logger.debug('push: coalesced into %s', merged)
+                self._emit_signals()
+                return True
             
-        print(f'[UNDO-STACK] Stack now has {len(self.actions)} actions, current_index: {self.current_index}')
+        # Add new action (the deque trims the oldest one once max_actions is reached)
+        if len(self._undo) == self._undo.maxlen:
+            self._on_action_evicted(self._undo[0])
+        self._undo.append(action)
+        self._track_size(action)
+        # Drop the oldest actions once the history outgrows its memory budget,
+        # always keeping the one just pushed
+        while self._total_bytes > self.max_bytes and len(self._undo) > 1:
+            self._on_action_evicted(self._undo.popleft())
+            
+        logger.debug('push: %d undoable actions', len(self._undo))
         self._emit_signals()
         return True
         
     def undo(self) -> bool:
         """Undo the last action."""
-        print(f'[UNDO-STACK] undo() called - can_undo: {self.can_undo()}')
         if not self.can_undo():
-            print(f'[UNDO-STACK] Cannot undo - no actions available')
+            logger.debug('undo: nothing to undo')
             return False
             
-        action = self.actions[self.current_index]
-        print(f'[UNDO-STACK] Attempting to undo: {action.description}')
-        if action.undo():
-            print(f'[UNDO-STACK] Successfully undid: {action.description}')
-            self.current_index -= 1
+        action = self._undo[-1]
+        logger.debug('undo: %s', action)
+        with self._transaction():
+            ok = action.undo()
+        if ok:
+            self._redo.append(self._undo.pop())
+            self._last_push_time = float('-inf')
             self._emit_signals()
             return True
         else:
-            print(f'[UNDO-STACK] Failed to undo: {action.description}')
+            logger.warning('undo: failed for %s', action)
         return False
         
     def redo(self) -> bool:
         """Redo the next action."""
-        print(f'[UNDO-STACK] redo() called - can_redo: {self.can_redo()}')
         if not self.can_redo():
-            print(f'[UNDO-STACK] Cannot redo - no actions available')
+            logger.debug('redo: nothing to redo')
             return False
             
-        action = self.actions[self.current_index + 1]
-        print(f'[UNDO-STACK] Attempting to redo: {action.description}')
-        if action.execute():
-            print(f'[UNDO-STACK] Successfully redid: {action.description}')
-            self.current_index += 1
+        action = self._redo[-1]
+        logger.debug('redo: %s', action)
+        with self._transaction():
+            ok = action.execute()
+        if ok:
+            self._undo.append(self._redo.pop())
+            self._last_push_time = float('-inf')
             self._emit_signals()
             return True
         else:
-            print(f'[UNDO-STACK] Failed to redo: {action.description}')
+            logger.warning('redo: failed for %s', action)
         return False
         
     def can_undo(self) -> bool:
         """Check if undo is possible."""
-        return self.current_index >= 0
+        return bool(self._undo)
         
     def can_redo(self) -> bool:
         """Check if redo is possible."""
-        return self.current_index < len(self.actions) - 1
+        return bool(self._redo)
         
     def undo_text(self) -> str:
         """Get description of action that would be undone."""
         if self.can_undo():
-            return f"Undo {self.actions[self.current_index].description}"
+            return f"Undo {self._undo[-1].description}"
         return "Undo"
         
     def redo_text(self) -> str:
         """Get description of action that would be redone."""
         if self.can_redo():
-            return f"Redo {self.actions[self.current_index + 1].description}"
+            return f"Redo {self._redo[-1].description}"
         return "Redo"
         
     def clear(self):
         """Clear the entire undo stack."""
-        self.actions.clear()
-        self.current_index = -1
+        for action in (*self._undo, *self._redo):
+            self._on_action_evicted(action)
+        self._undo.clear()
+        self._redo.clear()
+        self._sizes.clear()
+        self._total_bytes = 0
+        self._last_push_time = float('-inf')
         self._emit_signals()
         
+    def _on_action_evicted(self, action: UndoAction):
+        """Called when an action is dropped from the stack for good."""
+        self._forget_size(action)
+        action.release()
+        
+    def _track_size(self, action: UndoAction):
+        size = action.memory_usage()
+        self._sizes[id(action)] = size
+        self._total_bytes += size
+        
+    def _forget_size(self, action: UndoAction):
+        self._total_bytes -= self._sizes.pop(id(action), 0)
+        
+    @contextmanager
+    def batched(self):
+        """Hold back UI signals inside the block and emit them once on exit."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._pending_emit:
+                self._pending_emit = False
+                self._emit_signals()
+        
     def _emit_signals(self):
-        """Emit all relevant signals for UI updates."""
-        self.canUndoChanged.emit(self.can_undo())
-        self.canRedoChanged.emit(self.can_redo())
-        self.undoTextChanged.emit(self.undo_text())
-        self.redoTextChanged.emit(self.redo_text())
-
+        """Emit the UI signals whose value changed since they were last sent."""
+        if self._batch_depth:
+            self._pending_emit = True
+            return
+        undo, redo = self._undo, self._redo
+        # Built inline rather than via can_undo()/undo_text() etc. so each
+        # deque is tested once
+        state = (
+            bool(undo),
+            bool(redo),
+            f"Undo {undo[-1].description}" if undo else "Undo",
+            f"Redo {redo[-1].description}" if redo else "Redo",
+        )
+        last = self._last_emitted
+        if state == last:
+            return
+        self._last_emitted = state
+        can_undo, can_redo, undo_text, redo_text = state
+        if can_undo != last[0]:
+            self.canUndoChanged.emit(can_undo)
+        if can_redo != last[1]:
+            self.canRedoChanged.emit(can_redo)
+        if undo_text != last[2]:
+            self.undoTextChanged.emit(undo_text)
+        if redo_text != last[3]:
+            self.redoTextChanged.emit(redo_text)
 
 class StateSnapshot:
     """Captures state that can be restored later."""
     
+    __slots__ = ('data',)
+    
     def __init__(self):
         self.data: Dict[str, Any] = {}
         
@@ -163,18 +392,48 @@ class StateSnapshot:
                     with open(file_path, 'r', encoding='utf-8') as f:
                         self.data[key] = json.load(f)
                 else:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        self.data[key] = f.read()
+                    # Keep a copy on disk rather than the contents in memory
+                    pool_path = _acquire_snapshot_path()
+                    shutil.copy2(file_path, pool_path)
+                    self.release_key(key)
+                    self.data[key] = {'type': 'file_copy', 'src': str(pool_path)}
             except Exception:
                 self.data[key] = None
         else:
             self.data[key] = None
             
+    def capture_file_by_move(self, file_path: Path, key: str = None) -> bool:
+        """Capture a file that is about to be deleted by moving it into the pool.
+
+        On the same filesystem this is a rename, so nothing is read or copied;
+        otherwise shutil.move falls back to copy-and-delete. Either way the file
+        is gone from *file_path* afterwards. restore_file copies it back, so the
+        capture can be restored any number of times until release(). Returns
+        False if it couldn't be moved.
+        """
+        if key is None:
+            key = str(file_path)
+        if not file_path.exists():
+            self.release_key(key)
+            self.data[key] = None
+            return True
+        pool_path = _acquire_snapshot_path()
+        try:
+            shutil.move(str(file_path), str(pool_path))
+        except OSError:
+            _release_snapshot_path(pool_path)
+            return False
+        self.release_key(key)
+        self.data[key] = {'type': 'moved', 'src': str(pool_path)}
+        return True
+            
     def capture_directory_state(self, directory: Path, key: str):
         """Capture which files exist in a directory."""
-        if directory.exists():
-            self.data[key] = [f.name for f in directory.iterdir() if f.is_file()]
-        else:
+        # scandir's entries know their type, so is_file() needs no extra stat()
+        try:
+            with os.scandir(directory) as entries:
+                self.data[key] = [entry.name for entry in entries if entry.is_file()]
+        except (FileNotFoundError, NotADirectoryError):
             self.data[key] = []
             
     def restore_file(self, file_path: Path, key: str = None) -> bool:
@@ -193,16 +452,58 @@ class StateSnapshot:
             else:
                 # Restore file content
                 file_path.parent.mkdir(parents=True, exist_ok=True)
-                if file_path.suffix == '.json':
+                value = self.data[key]
+                kind = value.get('type') if isinstance(value, dict) else None
+                if kind == 'file_copy':
+                    shutil.copy2(value['src'], file_path)
+                elif kind == 'moved':
+                    # Copy rather than move back: after a redo deletes the file
+                    # again, the next undo still needs the backup. It is only
+                    # removed when the snapshot is released.
+                    shutil.copy2(value['src'], file_path)
+                elif isinstance(value, bytes):
+                    file_path.write_bytes(value)
+                elif file_path.suffix == '.json':
                     with open(file_path, 'w', encoding='utf-8') as f:
-                        json.dump(self.data[key], f, indent=2)
+                        json.dump(value, f, indent=2)
                 else:
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(self.data[key])
+                    file_path.write_bytes(value.encode('utf-8'))
             return True
         except Exception:
             return False
             
+    def memory_usage(self) -> int:
+        """Estimate the bytes held in memory by the captured values.
+
+        Pooled file copies live on disk and count only their bookkeeping.
+        """
+        total = 0
+        for key, value in self.data.items():
+            total += len(key)
+            if isinstance(value, (str, bytes)):
+                total += len(value)
+            elif isinstance(value, dict) and value.get('type') in ('file_copy', 'moved'):
+                total += len(value['src'])
+            elif value is not None:
+                try:
+                    total += len(json.dumps(value))
+                except (TypeError, ValueError):
+                    pass
+        return total
+        
+    def release_key(self, key: str):
+        """Delete the pooled copy behind *key*, if any."""
+        value = self.data.get(key)
+        kind = value.get('type') if isinstance(value, dict) else None
+        if kind in ('file_copy', 'moved'):
+            _release_snapshot_path(Path(value['src']))
+            self.data[key] = None
+            
+    def release(self):
+        """Delete all pooled file copies held by this snapshot."""
+        for key in list(self.data):
+            self.release_key(key)
+            
     def get(self, key: str, default=None):
         """Get captured data by key."""
         return self.data.get(key, default)
@@ -216,193 +517,204 @@ class StateSnapshot:
 class ToggleModAction(UndoAction):
     """Action for enabling/disabling mods."""
     
+    __slots__ = ('mod_id', 'tab_type', 'old_state', 'new_state', 'is_noop',
+                 'toggle_callback', 'refresh_callback', '_do_execute', '_do_undo')
+    
     def __init__(self, mod_id: str, tab_type: str, old_state: bool, new_state: bool, 
                  toggle_callback, refresh_callback):
-        action_type = "Enable" if new_state else "Disable"
-        super().__init__(f"{action_type} {mod_id}")
+        super().__init__()
         self.mod_id = mod_id
         self.tab_type = tab_type
         self.old_state = old_state
         self.new_state = new_state
+        self.is_noop = old_state == new_state
         self.toggle_callback = toggle_callback
         self.refresh_callback = refresh_callback
+        # Calls pre-bound once, so redo/undo don't re-gather their arguments
+        self._do_execute = partial(toggle_callback, mod_id, new_state)
+        self._do_undo = partial(toggle_callback, mod_id, old_state)
+        
+    def _build_description(self) -> str:
+        action_type = "Enable" if self.new_state else "Disable"
+        return f"{action_type} {self.mod_id}"
+        
+    def try_merge(self, other: UndoAction) -> bool:
+        """Absorb a follow-up toggle of the same mod."""
+        if (type(other) is not ToggleModAction or other.mod_id != self.mod_id
+                or other.tab_type != self.tab_type or other.old_state != self.new_state):
+            return False
+        self.new_state = other.new_state
+        self.is_noop = self.old_state == self.new_state
+        self._do_execute = partial(self.toggle_callback, self.mod_id, self.new_state)
+        self._description = None
+        return True
         
     def execute(self) -> bool:
         """Toggle to new state."""
-        try:
-            self.toggle_callback(self.mod_id, self.new_state)
-            self.refresh_callback()
-            return True
-        except Exception:
-            return False
+        return _safe_call(self._do_execute, self.refresh_callback)
             
     def undo(self) -> bool:
         """Toggle back to old state."""
-        try:
-            self.toggle_callback(self.mod_id, self.old_state)
-            self.refresh_callback()
-            return True
-        except Exception:
-            return False
+        return _safe_call(self._do_undo, self.refresh_callback)
+            
+    def coalesce_with(self, other: UndoAction) -> Optional[UndoAction]:
+        """Promote to a BulkToggleAction holding both toggles."""
+        if not isinstance(other, ToggleModAction) or other.tab_type != self.tab_type:
+            return None
+        if self.tab_type == "MagicLoader":
+            # A generic bulk action would reload the CLI once per mod on undo/redo
+            return None
+        merged = BulkToggleAction(
+            [(self.mod_id, self.old_state, self.new_state)], self.tab_type,
+            self.toggle_callback, self.refresh_callback
+        )
+        merged.executed = True
+        return merged.coalesce_with(other)
 
 
 class RenameAction(UndoAction):
     """Action for renaming mods or groups."""
     
+    __slots__ = ('target_id', 'old_name', 'new_name', 'rename_callback', 'refresh_callback',
+                 '_do_execute', '_do_undo')
+    
     def __init__(self, target_id: str, old_name: str, new_name: str, 
                  rename_callback, refresh_callback):
-        super().__init__(f"Rename '{old_name}' to '{new_name}'")
+        super().__init__()
         self.target_id = target_id
         self.old_name = old_name
         self.new_name = new_name
         self.rename_callback = rename_callback
         self.refresh_callback = refresh_callback
+        self._do_execute = partial(rename_callback, target_id, new_name)
+        self._do_undo = partial(rename_callback, target_id, old_name)
+        
+    def _build_description(self) -> str:
+        return f"Rename '{self.old_name}' to '{self.new_name}'"
         
     def execute(self) -> bool:
         """Apply new name."""
-        try:
-            self.rename_callback(self.target_id, self.new_name)
-            self.refresh_callback()
-            return True
-        except Exception:
-            return False
+        return _safe_call(self._do_execute, self.refresh_callback)
             
     def undo(self) -> bool:
         """Restore old name."""
-        try:
-            self.rename_callback(self.target_id, self.old_name)
-            self.refresh_callback()
-            return True
-        except Exception:
-            return False
+        return _safe_call(self._do_undo, self.refresh_callback)
 
 
 class GroupChangeAction(UndoAction):
     """Action for moving mods between groups."""
     
+    __slots__ = ('mod_id', 'old_group', 'new_group', 'group_callback', 'refresh_callback',
+                 '_do_execute', '_do_undo')
+    
     def __init__(self, mod_id: str, old_group: str, new_group: str, 
                  group_callback, refresh_callback):
-        super().__init__(f"Move '{mod_id}' from '{old_group}' to '{new_group}'")
+        super().__init__()
         self.mod_id = mod_id
         self.old_group = old_group
         self.new_group = new_group
         self.group_callback = group_callback
         self.refresh_callback = refresh_callback
+        self._do_execute = partial(group_callback, mod_id, new_group)
+        self._do_undo = partial(group_callback, mod_id, old_group)
+        
+    def _build_description(self) -> str:
+        return f"Move '{self.mod_id}' from '{self.old_group}' to '{self.new_group}'"
         
     def execute(self) -> bool:
         """Move to new group."""
-        try:
-            self.group_callback(self.mod_id, self.new_group)
-            self.refresh_callback()
-            return True
-        except Exception:
-            return False
+        return _safe_call(self._do_execute, self.refresh_callback)
             
     def undo(self) -> bool:
         """Move back to old group."""
-        try:
-            self.group_callback(self.mod_id, self.old_group)
-            self.refresh_callback()
-            return True
-        except Exception:
-            return False
+        return _safe_call(self._do_undo, self.refresh_callback)
 
 
 class PakToggleAction(UndoAction):
     """Special action for PAK toggles that looks up fresh pak_info at execution time."""
     
+    __slots__ = ('pak_id', 'old_state', 'new_state', 'is_noop', 'game_path', 'refresh_callback')
+    
     def __init__(self, pak_id: str, old_state: bool, new_state: bool, 
                  game_path: str, refresh_callback):
-        action_type = "Enable" if new_state else "Disable"
-        super().__init__(f"{action_type} {pak_id}")
+        super().__init__()
         self.pak_id = pak_id
         self.old_state = old_state
         self.new_state = new_state
+        self.is_noop = old_state == new_state
         self.game_path = game_path
         self.refresh_callback = refresh_callback
         
+    def _build_description(self) -> str:
+        action_type = "Enable" if self.new_state else "Disable"
+        return f"{action_type} {self.pak_id}"
+        
+    def try_merge(self, other: UndoAction) -> bool:
+        """Absorb a follow-up toggle of the same PAK."""
+        if (type(other) is not PakToggleAction or other.pak_id != self.pak_id
+                or other.old_state != self.new_state):
+            return False
+        self.new_state = other.new_state
+        self.is_noop = self.old_state == self.new_state
+        self._description = None
+        return True
+        
     def _find_pak_info(self) -> tuple:
         """Find current pak_info by pak_id. Returns (pak_info, found)."""
-        from mod_manager.pak_manager import list_managed_paks
-        all_paks = list_managed_paks()
-        
-        # Extract the base name from the original pak_id (remove any subfolder prefix)
-        original_name = self.pak_id.split('|')[-1]  # Get the actual filename part
-        print(f'[PAK-ACTION] _find_pak_info: looking for base name "{original_name}" from pak_id "{self.pak_id}"')
-        
-        # First try exact match (for cases where pak_id hasn't changed)
-        for pak in all_paks:
-            pak_subfolder = pak.get('subfolder', '') or ''
-            reconstructed_id = f"{pak_subfolder}|{pak['name']}"
-            if reconstructed_id == self.pak_id:
-                print(f'[PAK-ACTION] _find_pak_info: found exact match with pak_id "{reconstructed_id}"')
-                return pak, True
-        
-        # If exact match fails, try to find by base name regardless of folder
-        for pak in all_paks:
-            if pak['name'] == original_name:
-                pak_subfolder = pak.get('subfolder', '') or ''
-                reconstructed_id = f"{pak_subfolder}|{pak['name']}"
-                print(f'[PAK-ACTION] _find_pak_info: found base name match with pak_id "{reconstructed_id}"')
-                return pak, True
-        
-        print(f'[PAK-ACTION] _find_pak_info: no match found for base name "{original_name}"')
-        return None, False
+        # No per-action cache on purpose: activate/deactivate bump pak_mods_epoch(),
+        # so a pak_info found by execute() is always stale by the time undo() runs.
+        # get_pak() probes an index rebuilt at most once per change.
+        pak = get_pak(self.pak_id)
+        if __debug__ and logger.isEnabledFor(logging.DEBUG):
+            logger.debug('_find_pak_info: %r -> %s', self.pak_id, 'found' if pak is not None else 'no match')
+        return (pak, True) if pak is not None else (None, False)
         
     def execute(self) -> bool:
         """Toggle to new state."""
-        print(f'[PAK-ACTION] execute() called: pak_id={self.pak_id}, new_state={self.new_state}')
+        if __debug__ and logger.isEnabledFor(logging.DEBUG):
+            logger.debug('execute: pak_id=%s new_state=%s', self.pak_id, self.new_state)
         pak_info, found = self._find_pak_info()
         if not found:
-            print(f'[PAK-ACTION] execute() failed: pak_info not found for {self.pak_id}')
+            logger.warning('execute: pak_info not found for %s', self.pak_id)
             return False
-            
-        print(f'[PAK-ACTION] execute() found pak_info: {pak_info}')
+
         try:
-            from mod_manager.pak_manager import activate_pak, deactivate_pak
             if self.new_state:
-                print(f'[PAK-ACTION] execute() calling activate_pak')
                 activate_pak(self.game_path, pak_info)
             else:
-                print(f'[PAK-ACTION] execute() calling deactivate_pak')
                 deactivate_pak(self.game_path, pak_info)
-            print(f'[PAK-ACTION] execute() pak operation succeeded, calling refresh')
             self.refresh_callback()
-            print(f'[PAK-ACTION] execute() completed successfully')
             return True
         except Exception as e:
-            print(f'[PAK-ACTION] execute() failed with exception: {e}')
+            logger.warning('execute: %s failed: %s', self.pak_id, e)
             return False
             
     def undo(self) -> bool:
         """Toggle back to old state."""
-        print(f'[PAK-ACTION] undo() called: pak_id={self.pak_id}, old_state={self.old_state}')
+        if __debug__ and logger.isEnabledFor(logging.DEBUG):
+            logger.debug('undo: pak_id=%s old_state=%s', self.pak_id, self.old_state)
         pak_info, found = self._find_pak_info()
         if not found:
-            print(f'[PAK-ACTION] undo() failed: pak_info not found for {self.pak_id}')
+            logger.warning('undo: pak_info not found for %s', self.pak_id)
             return False
-            
-        print(f'[PAK-ACTION] undo() found pak_info: {pak_info}')
+
         try:
-            from mod_manager.pak_manager import activate_pak, deactivate_pak
             if self.old_state:
-                print(f'[PAK-ACTION] undo() calling activate_pak')
                 activate_pak(self.game_path, pak_info)
             else:
-                print(f'[PAK-ACTION] undo() calling deactivate_pak')
                 deactivate_pak(self.game_path, pak_info)
-            print(f'[PAK-ACTION] undo() pak operation succeeded, calling refresh')
             self.refresh_callback()
-            print(f'[PAK-ACTION] undo() completed successfully')
             return True
         except Exception as e:
-            print(f'[PAK-ACTION] undo() failed with exception: {e}')
+            logger.warning('undo: %s failed: %s', self.pak_id, e)
             return False
 
 
 class FileOperationAction(UndoAction):
     """Action for file-based operations (delete, move)."""
     
+    __slots__ = ('state_snapshot', 'restore_callback', 'refresh_callback', 'executed')
+    
     def __init__(self, description: str, state_snapshot: StateSnapshot, 
                  restore_callback, refresh_callback):
         super().__init__(description)
@@ -426,37 +738,51 @@ class FileOperationAction(UndoAction):
             return True
         except Exception:
             return False
+            
+    def release(self):
+        """Delete the snapshot's pooled file copies."""
+        self.state_snapshot.release()
+        
+    def memory_usage(self) -> int:
+        return self.state_snapshot.memory_usage()
 
 
 class LoadOrderAction(UndoAction):
     """Action for ESP load order changes via drag-and-drop."""
     
+    __slots__ = ('old_order', 'new_order', 'is_noop', 'set_order_callback',
+                 'refresh_callback', 'executed')
+    
     def __init__(self, old_order: list, new_order: list, 
                  set_order_callback, refresh_callback):
-        # Create a concise description of the change
-        if len(old_order) != len(new_order):
-            super().__init__(f"Load Order Change ({len(old_order)} → {len(new_order)} mods)")
-        else:
-            # Find what moved
-            moved_items = []
-            for i, (old_item, new_item) in enumerate(zip(old_order, new_order)):
-                if old_item != new_item:
-                    moved_items.append(new_item)
-            
-            if moved_items:
-                if len(moved_items) == 1:
-                    super().__init__(f"Move '{moved_items[0]}'")
-                else:
-                    super().__init__(f"Reorder {len(moved_items)} mods")
-            else:
-                super().__init__("Load Order Change")
+        super().__init__()
+        # Frozen copies: smaller than lists and safe to hand out without copying
+        old_order = tuple(old_order)
+        new_order = tuple(new_order)
         
-        self.old_order = old_order.copy()
-        self.new_order = new_order.copy()
+        self.old_order = old_order
+        self.new_order = new_order
+        self.is_noop = self.old_order == self.new_order
         self.set_order_callback = set_order_callback
         self.refresh_callback = refresh_callback
         self.executed = False
         
+    def memory_usage(self) -> int:
+        return sum(map(len, self.old_order)) + sum(map(len, self.new_order))
+        
+    def _build_description(self) -> str:
+        """Create a concise description of the change."""
+        old_order, new_order = self.old_order, self.new_order
+        if len(old_order) != len(new_order):
+            return f"Load Order Change ({len(old_order)} → {len(new_order)} mods)"
+        # Find what moved
+        moved_items = list(compress(new_order, map(ne, old_order, new_order)))
+        if len(moved_items) == 1:
+            return f"Move '{moved_items[0]}'"
+        if moved_items:
+            return f"Reorder {len(moved_items)} mods"
+        return "Load Order Change"
+        
     def execute(self) -> bool:
         """Apply new load order."""
         try:
@@ -465,7 +791,7 @@ class LoadOrderAction(UndoAction):
             self.executed = True
             return True
         except Exception as e:
-            print(f"LoadOrderAction.execute() failed: {e}")
+            logger.warning('LoadOrderAction.execute() failed: %s', e)
             return False
             
     def undo(self) -> bool:
@@ -477,13 +803,16 @@ class LoadOrderAction(UndoAction):
             self.refresh_callback()
             return True
         except Exception as e:
-            print(f"LoadOrderAction.undo() failed: {e}")
+            logger.warning('LoadOrderAction.undo() failed: %s', e)
             return False
 
 
 class BulkToggleAction(UndoAction):
     """Undo action for bulk enabling/disabling multiple mods at once."""
     
+    __slots__ = ('changes', 'tab_type', 'toggle_callback', 'refresh_callback',
+                 '_enable_count', 'executed')
+    
     def __init__(self, changes: list, tab_type: str, toggle_callback, refresh_callback):
         """
         Initialize bulk toggle action.
@@ -498,28 +827,73 @@ class BulkToggleAction(UndoAction):
         self.tab_type = tab_type
         self.toggle_callback = toggle_callback
         self.refresh_callback = refresh_callback
+        self._enable_count = _count_enabled(changes)
+        super().__init__()
         
-        # Create description based on the changes
-        enable_count = sum(1 for _, _, new_state in changes if new_state)
-        disable_count = len(changes) - enable_count
+    def memory_usage(self) -> int:
+        return sum(len(mod_id) for mod_id, _, _ in self.changes)
         
-        if enable_count > 0 and disable_count > 0:
-            self.description = f"Bulk Toggle {len(changes)} {tab_type} mods"
-        elif enable_count > 0:
-            self.description = f"Bulk Enable {enable_count} {tab_type} mods"
+    def _build_description(self) -> str:
+        """Create description based on the changes."""
+        return _bulk_desc(len(self.changes), self._enable_count, self.tab_type)
+    
+    def coalesce_with(self, other: UndoAction) -> Optional[UndoAction]:
+        """Absorb a following toggle (single or bulk) of the same tab type."""
+        if isinstance(other, ToggleModAction):
+            incoming = [(other.mod_id, other.old_state, other.new_state)]
+        elif type(other) is BulkToggleAction:
+            incoming = other.changes
         else:
-            self.description = f"Bulk Disable {disable_count} {tab_type} mods"
+            return None
+        if other.tab_type != self.tab_type:
+            return None
+        # Changes are undone in list order, so a mod may only appear once
+        seen = {mod_id for mod_id, _, _ in self.changes}
+        if any(mod_id in seen for mod_id, _, _ in incoming):
+            return None
+        self.changes = self.changes + list(incoming)
+        self._enable_count += _count_enabled(incoming)
+        self._description = None  # rebuilt from the merged changes on demand
+        return self
+    
+    def _apply(self, use_new_state: bool) -> bool:
+        """Toggle every mod to its new (or old) state, all or nothing.
+
+        If a toggle fails, the mods already switched are put back in reverse
+        order so a failed execute/undo never leaves the change half applied.
+        """
+        toggle = self.toggle_callback
+        applied = []
+        try:
+            for mod_id, old_state, new_state in self.changes:
+                target, previous = (new_state, old_state) if use_new_state else (old_state, new_state)
+                toggle(mod_id, target)
+                applied.append((mod_id, previous))
+        except Exception as e:
+            logger.warning('BulkToggleAction: toggling %s failed (%s), rolling back %d change(s)', mod_id, e, len(applied))
+            for mod_id, previous in reversed(applied):
+                try:
+                    toggle(mod_id, previous)
+                except Exception as rollback_error:
+                    logger.warning('BulkToggleAction: rollback of %s failed: %s', mod_id, rollback_error)
+            # One refresh so the UI matches whatever is on disk now
+            try:
+                self.refresh_callback()
+            except Exception:
+                pass
+            return False
+        self.refresh_callback()
+        return True
     
     def execute(self) -> bool:
         """Execute the bulk toggle by applying all changes."""
         try:
-            for mod_id, old_state, new_state in self.changes:
-                self.toggle_callback(mod_id, new_state)
-            self.refresh_callback()
+            if not self._apply(use_new_state=True):
+                return False
             self.executed = True
             return True
         except Exception as e:
-            print(f"BulkToggleAction.execute() failed: {e}")
+            logger.warning('BulkToggleAction.execute() failed: %s', e)
             return False
     
     def undo(self) -> bool:
@@ -527,19 +901,20 @@ class BulkToggleAction(UndoAction):
         if not hasattr(self, 'executed') or not self.executed:
             return False
         try:
-            for mod_id, old_state, new_state in self.changes:
-                self.toggle_callback(mod_id, old_state)
-            self.refresh_callback()
+            if not self._apply(use_new_state=False):
+                return False
             self.executed = False
             return True
         except Exception as e:
-            print(f"BulkToggleAction.undo() failed: {e}")
+            logger.warning('BulkToggleAction.undo() failed: %s', e)
             return False
 
 
 class MagicLoaderBulkToggleAction(UndoAction):
     """Special bulk action for MagicLoader that batches JSON file operations and calls CLI once."""
     
+    __slots__ = ('changes', 'game_path', 'refresh_callback', '_enable_count', 'executed')
+    
     def __init__(self, changes: list, game_path: str, refresh_callback):
         """
         Initialize MagicLoader bulk toggle action.
@@ -552,17 +927,27 @@ class MagicLoaderBulkToggleAction(UndoAction):
         self.changes = changes
         self.game_path = game_path
         self.refresh_callback = refresh_callback
+        self._enable_count = _count_enabled(changes)
+        super().__init__()
         
-        # Create description based on the changes
-        enable_count = sum(1 for _, _, new_state in changes if new_state)
-        disable_count = len(changes) - enable_count
+    def memory_usage(self) -> int:
+        return sum(len(mod_id) for mod_id, _, _ in self.changes)
         
-        if enable_count > 0 and disable_count > 0:
-            self.description = f"Bulk Toggle {len(changes)} MagicLoader mods"
-        elif enable_count > 0:
-            self.description = f"Bulk Enable {enable_count} MagicLoader mods"
+    def _build_description(self) -> str:
+        """Create description based on the changes."""
+        return _bulk_desc(len(self.changes), self._enable_count, "MagicLoader")
+    
+    def _partition(self, use_new_state: bool) -> Tuple[List[str], List[str]]:
+        """Split the changes into (mods to activate, mods to deactivate) in one pass."""
+        activate, deactivate = [], []
+        add_active, add_inactive = activate.append, deactivate.append
+        if use_new_state:
+            for mod_name, _old, new_state in self.changes:
+                (add_active if new_state else add_inactive)(mod_name)
         else:
-            self.description = f"Bulk Disable {disable_count} MagicLoader mods"
+            for mod_name, old_state, _new in self.changes:
+                (add_active if old_state else add_inactive)(mod_name)
+        return activate, deactivate
     
     def execute(self) -> bool:
         """Execute the bulk toggle using batched operations."""
@@ -572,8 +957,7 @@ class MagicLoaderBulkToggleAction(UndoAction):
             )
             
             # Separate changes into activate and deactivate lists
-            mods_to_activate = [mod_name for mod_name, old_state, new_state in self.changes if new_state]
-            mods_to_deactivate = [mod_name for mod_name, old_state, new_state in self.changes if not new_state]
+            mods_to_activate, mods_to_deactivate = self._partition(use_new_state=True)
             
             total_successful = 0
             total_failed = 0
@@ -583,22 +967,22 @@ class MagicLoaderBulkToggleAction(UndoAction):
                 successful, failed = bulk_activate_ml_mods(self.game_path, mods_to_activate)
                 total_successful += successful
                 total_failed += failed
-                print(f"[MagicLoader] Bulk activated {successful}/{len(mods_to_activate)} mods")
+                logger.debug('MagicLoader: bulk activated %d/%d mods', successful, len(mods_to_activate))
             
             # Batch deactivate mods (no CLI calls)
             if mods_to_deactivate:
                 successful, failed = bulk_deactivate_ml_mods(self.game_path, mods_to_deactivate)
                 total_successful += successful
                 total_failed += failed
-                print(f"[MagicLoader] Bulk deactivated {successful}/{len(mods_to_deactivate)} mods")
+                logger.debug('MagicLoader: bulk deactivated %d/%d mods', successful, len(mods_to_deactivate))
             
             # Now call CLI once to reload configuration
             if total_successful > 0:
                 cli_success, cli_output = reload_ml_config(self.game_path)
                 if not cli_success:
-                    print(f"[MagicLoader] CLI reload failed: {cli_output}")
+                    logger.warning('MagicLoader: CLI reload failed: %s', cli_output)
                 else:
-                    print(f"[MagicLoader] CLI reload successful: {cli_output}")
+                    logger.debug('MagicLoader: CLI reload successful: %s', cli_output)
             
             # Refresh UI
             self.refresh_callback()
@@ -608,11 +992,11 @@ class MagicLoaderBulkToggleAction(UndoAction):
                 self.executed = True
                 return True
             else:
-                print(f"[MagicLoader] All bulk operations failed ({total_failed} failures)")
+                logger.warning('MagicLoader: all bulk operations failed (%d failures)', total_failed)
                 return False
                 
         except Exception as e:
-            print(f"MagicLoaderBulkToggleAction.execute() failed: {e}")
+            logger.warning('MagicLoaderBulkToggleAction.execute() failed: %s', e)
             return False
     
     def undo(self) -> bool:
@@ -626,8 +1010,7 @@ class MagicLoaderBulkToggleAction(UndoAction):
             )
             
             # Reverse the changes - swap old_state and new_state
-            mods_to_activate = [mod_name for mod_name, old_state, new_state in self.changes if old_state]
-            mods_to_deactivate = [mod_name for mod_name, old_state, new_state in self.changes if not old_state]
+            mods_to_activate, mods_to_deactivate = self._partition(use_new_state=False)
             
             total_successful = 0
             total_failed = 0
@@ -637,22 +1020,22 @@ class MagicLoaderBulkToggleAction(UndoAction):
                 successful, failed = bulk_activate_ml_mods(self.game_path, mods_to_activate)
                 total_successful += successful
                 total_failed += failed
-                print(f"[MagicLoader] Undo: Bulk activated {successful}/{len(mods_to_activate)} mods")
+                logger.debug('MagicLoader: undo bulk activated %d/%d mods', successful, len(mods_to_activate))
             
             # Batch deactivate mods (revert to old disabled state)
             if mods_to_deactivate:
                 successful, failed = bulk_deactivate_ml_mods(self.game_path, mods_to_deactivate)
                 total_successful += successful
                 total_failed += failed
-                print(f"[MagicLoader] Undo: Bulk deactivated {successful}/{len(mods_to_deactivate)} mods")
+                logger.debug('MagicLoader: undo bulk deactivated %d/%d mods', successful, len(mods_to_deactivate))
             
             # Now call CLI once to reload configuration
             if total_successful > 0:
                 cli_success, cli_output = reload_ml_config(self.game_path)
                 if not cli_success:
-                    print(f"[MagicLoader] Undo: CLI reload failed: {cli_output}")
+                    logger.warning('MagicLoader: undo CLI reload failed: %s', cli_output)
                 else:
-                    print(f"[MagicLoader] Undo: CLI reload successful: {cli_output}")
+                    logger.debug('MagicLoader: undo CLI reload successful: %s', cli_output)
             
             # Refresh UI
             self.refresh_callback()
@@ -661,5 +1044,21 @@ class MagicLoaderBulkToggleAction(UndoAction):
             return total_successful > 0
             
         except Exception as e:
-            print(f"MagicLoaderBulkToggleAction.undo() failed: {e}")
-            return False 
\ No newline at end of file
+            logger.warning('MagicLoaderBulkToggleAction.undo() failed: %s', e)
+            return False
+    
+    def coalesce_with(self, other: UndoAction) -> Optional[UndoAction]:
+        """Absorb a following MagicLoader toggle; the merged step still reloads the CLI once."""
+        if isinstance(other, ToggleModAction) and other.tab_type == "MagicLoader":
+            incoming = [(other.mod_id, other.old_state, other.new_state)]
+        elif isinstance(other, MagicLoaderBulkToggleAction) and other.game_path == self.game_path:
+            incoming = other.changes
+        else:
+            return None
+        seen = {mod_name for mod_name, _, _ in self.changes}
+        if any(mod_name in seen for mod_name, _, _ in incoming):
+            return None
+        self.changes = self.changes + list(incoming)
+        self._enable_count += _count_enabled(incoming)
+        self._description = None  # rebuilt from the merged changes on demand
+        return self 
\ No newline at end of file
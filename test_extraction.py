@@ -3,19 +3,24 @@
 Test script to verify archive extraction dependencies are working correctly.
 """
 
-def test_py7zr():
-    """Test py7zr import and functionality."""
+from importlib.metadata import version, PackageNotFoundError
+
+def _installed_version(dist_name):
+    """Return the installed version of a distribution without importing it."""
     try:
-        import py7zr
-        print("✓ py7zr imported successfully")
-        print(f"  Version: {py7zr.__version__}")
-        return True
-    except ImportError as e:
-        print(f"✗ py7zr import failed: {e}")
-        return False
-    except Exception as e:
-        print(f"✗ py7zr error: {e}")
+        return version(dist_name)
+    except PackageNotFoundError:
+        return None
+
+def test_py7zr():
+    """Test that py7zr is installed."""
+    py7zr_version = _installed_version("py7zr")
+    if py7zr_version is None:
+        print("✗ py7zr is not installed")
         return False
+    print("✓ py7zr is installed")
+    print(f"  Version: {py7zr_version}")
+    return True
 
 def test_pyunpack():
     """Test pyunpack import and functionality."""
@@ -44,26 +49,27 @@ def test_pyunpack():
         return False
 
 def test_patool():
-    """Test patool import and functionality (optional)."""
-    try:
-        import patool
-        print("✓ patool imported successfully")
-        print(f"  Version: {patool.__version__}")
-        return True
-    except ImportError as e:
-        print(f"⚠ patool import failed: {e}")
+    """Test that patool is installed (optional)."""
+    patool_version = _installed_version("patool")
+    if patool_version is None:
+        print("⚠ patool is not installed")
         print("  Note: patool is optional - pyunpack may still work with other backends")
         return False
-    except Exception as e:
-        print(f"⚠ patool error: {e}")
-        return False
+    print("✓ patool is installed")
+    print(f"  Version: {patool_version}")
+    return True
 
 def test_rarfile():
     """Test rarfile import and functionality."""
+    rarfile_version = _installed_version("rarfile")
+    if rarfile_version is None:
+        print("✗ rarfile is not installed")
+        return False
     try:
+        # Imported only for the runtime UnRAR tool lookup
         import rarfile
         print("✓ rarfile imported successfully")
-        print(f"  Version: {rarfile.__version__}")
+        print(f"  Version: {rarfile_version}")
         
         # Check if unrar tool is available
         if rarfile.UNRAR_TOOL:
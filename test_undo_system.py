@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for the undo system.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "oblivion_mod_manager"))
+
+from mod_manager import pak_manager
+from mod_manager.utils import mark_pak_mods_changed
+
+try:
+    from ui.undo_system import BulkToggleAction, StateSnapshot
+except ImportError:  # PyQt5 not installed
+    BulkToggleAction = StateSnapshot = None
+
+
+@unittest.skipIf(BulkToggleAction is None, "PyQt5 is not installed")
+class BulkToggleRollbackTest(unittest.TestCase):
+    def test_failure_mid_pass_rolls_back_in_reverse(self):
+        calls = []
+        refreshes = []
+
+        def toggle(mod_id, state):
+            calls.append((mod_id, state))
+            if mod_id == "c" and state:
+                raise OSError("disk full")
+
+        changes = [("a", False, True), ("b", False, True), ("c", False, True), ("d", False, True)]
+        action = BulkToggleAction(changes, "PAK", toggle, lambda: refreshes.append(True))
+
+        self.assertFalse(action.execute())
+        self.assertEqual(calls, [("a", True), ("b", True), ("c", True), ("b", False), ("a", False)])
+        self.assertEqual(len(refreshes), 1)
+        # Nothing was applied, so there is nothing to undo
+        self.assertFalse(action.undo())
+
+
+@unittest.skipIf(StateSnapshot is None, "PyQt5 is not installed")
+class StateSnapshotTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp, True)
+
+    def test_moved_file_survives_repeated_undo(self):
+        path = self.tmp / "mod.esp"
+        path.write_bytes(b"plugin")
+        snapshot = StateSnapshot()
+        self.assertTrue(snapshot.capture_file_by_move(path))
+        self.assertFalse(path.exists())
+
+        for _ in range(2):  # undo, redo (delete again), undo
+            self.assertTrue(snapshot.restore_file(path))
+            self.assertEqual(path.read_bytes(), b"plugin")
+            path.unlink()
+
+        backup = snapshot.get(str(path))["src"]
+        snapshot.release()
+        self.assertFalse(os.path.exists(backup))
+
+    def test_released_copy_is_deleted(self):
+        path = self.tmp / "mod.dll"
+        path.write_bytes(b"binary")
+        snapshot = StateSnapshot()
+        snapshot.capture_file(path)
+        copy = snapshot.get(str(path))["src"]
+        self.assertTrue(os.path.exists(copy))
+
+        snapshot.release_key(str(path))
+        self.assertFalse(os.path.exists(copy))
+
+
+class ManagedPakIndexTest(unittest.TestCase):
+    def test_index_is_reloaded_after_a_change(self):
+        # What a rollback sees after activate_pak/deactivate_pak rewrote the list
+        disk = [{"name": "a.pak", "subfolder": None, "active": False, "files": ["old/a.pak"]}]
+        with mock.patch.object(pak_manager, "load_pak_mods", side_effect=lambda: [dict(p) for p in disk]):
+            mark_pak_mods_changed()
+            before = pak_manager.managed_pak_index()["|a.pak"]
+            disk[0] = {"name": "a.pak", "subfolder": None, "active": True, "files": ["new/a.pak"]}
+            mark_pak_mods_changed()
+            after = pak_manager.managed_pak_index()["|a.pak"]
+        self.assertIsNot(before, after)
+        self.assertEqual(after["files"], ["new/a.pak"])
+        self.assertTrue(after["active"])
+
+    def test_callers_cannot_corrupt_the_cache(self):
+        disk = [{"name": "a.pak", "subfolder": None, "active": False}]
+        with mock.patch.object(pak_manager, "load_pak_mods", side_effect=lambda: [dict(p) for p in disk]):
+            mark_pak_mods_changed()
+            pak_manager.list_managed_paks()[0]["subfolder"] = "LogicMods"
+            pak_manager.get_pak("|a.pak")["active"] = True
+            with self.assertRaises(TypeError):
+                pak_manager.managed_pak_index()["|a.pak"]["active"] = True
+            self.assertEqual(pak_manager.list_managed_paks(), disk)
+
+
+if __name__ == "__main__":
+    unittest.main()